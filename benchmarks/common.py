@@ -0,0 +1,31 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/benchmarks/common.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-28 19:02
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION: Timing and reporting helpers shared by the benchmark modules
+#
+# HISTORY:
+# *************************************************************
+
+### Standard packages ###
+from statistics import median
+from time import perf_counter
+from typing import Any, Callable, Dict, List
+
+
+def report(results: Dict[str, float]) -> None:
+  for name, value in results.items():
+    print(f"{name:<56} {value:14.3f}")
+
+
+def timed(rounds: int, function: Callable[..., Any], *arguments: Any, **keywords: Any) -> float:
+  """Median wall-clock seconds of `function(*arguments, **keywords)` over `rounds` calls"""
+  timings: List[float] = []
+  for _ in range(rounds):
+    started: float = perf_counter()
+    function(*arguments, **keywords)
+    timings.append(perf_counter() - started)
+  return median(timings)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/benchmarks/html_rewriter.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-23 15:41
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION: Throughput of the single-pass template rewriter on large and numerous templates
+#
+# HISTORY:
+# *************************************************************
+
+### Standard packages ###
+from os import makedirs, path
+from sys import exit
+from tempfile import TemporaryDirectory
+from typing import Dict, Tuple
+
+### Local modules ###
+from common import report, timed
+from rizzler.html_rewriter import EntryAssets, rewrite, rewrite_templates
+
+DOCUMENT_SIZES: Tuple[int, ...] = (64 << 10, 1 << 20, 8 << 20)
+ROUNDS: int = 5
+TEMPLATE_COUNTS: Tuple[int, ...] = (32, 256, 1024)
+
+
+def document(size: int) -> bytes:
+  head: bytes = (
+    b"<!DOCTYPE html>\n<html>\n  <head>\n    <title>{{ title }}</title>\n"
+    b"    {{ vite_hmr_client() }}\n    {{ vite_asset('pages/main.js') }}\n  </head>\n  <body>\n"
+  )
+  row: bytes = (
+    b'    <section class="card"><h2>{{ item.name }}</h2>'
+    b"<p>Lorem ipsum dolor sit amet, consectetur adipiscing elit.</p></section>\n"
+  )
+  rows: int = max(1, (size - len(head)) // len(row))
+  return head + row * rows + b"  </body>\n</html>\n"
+
+
+def resolve(entry: str) -> EntryAssets:
+  return EntryAssets(
+    head=('<link href="/assets/main-BRTx1BLk.css" rel="stylesheet">',),
+    body=('<script src="/assets/main-DiwrgTda.js" type="module"></script>',),
+  )
+
+
+def measure() -> Dict[str, float]:
+  results: Dict[str, float] = {}
+  for size in DOCUMENT_SIZES:
+    content: bytes = document(size)
+    elapsed: float = timed(ROUNDS, rewrite, content, resolve)
+    results[f"rewrite_{size >> 10}kib_mib_per_s"] = len(content) / (1 << 20) / elapsed
+  for count in TEMPLATE_COUNTS:
+    with TemporaryDirectory() as workspace:
+      source: str = path.join(workspace, "templates")
+      makedirs(source)
+      content = document(16 << 10)
+      for index in range(count):
+        with open(path.join(source, f"page_{index:04d}.html"), "wb") as file:
+          file.write(content)
+      results[f"rewrite_templates_{count}_serial_ms"] = 1000 * timed(
+        ROUNDS,
+        rewrite_templates,
+        source,
+        path.join(workspace, "serial"),
+        resolve,
+        parallel_threshold=count + 1,
+      )
+      results[f"rewrite_templates_{count}_pooled_ms"] = 1000 * timed(
+        ROUNDS,
+        rewrite_templates,
+        source,
+        path.join(workspace, "pooled"),
+        resolve,
+        parallel_threshold=1,
+      )
+  return results
+
+
+def main() -> int:
+  report(measure())
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
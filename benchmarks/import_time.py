@@ -0,0 +1,76 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/benchmarks/import_time.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-16 11:05
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION: Cold import time of `rizzler` and guard against CLI-only modules leaking into it
+#
+# HISTORY:
+# *************************************************************
+
+### Standard packages ###
+from statistics import median
+from subprocess import run
+from sys import executable, exit
+from typing import Dict, List, Tuple
+
+### Local modules ###
+from common import report
+
+CLI_ONLY_MODULES: Tuple[str, ...] = (
+  "click",
+  "rich",
+  "tree_sitter",
+  "tree_sitter_html",
+  "tree_sitter_javascript",
+)
+ROUNDS: int = 15
+STATEMENTS: Dict[str, str] = {
+  "import_rizzler_ms": "from rizzler import Rizzler",
+  "import_rizzler_templates_ms": "from rizzler import Rizzler, RizzleTemplates",
+}
+
+
+def cold_import(statement: str) -> Tuple[float, List[str]]:
+  script: str = (
+    "import sys, time\n"
+    "started = time.perf_counter()\n"
+    f"{statement}\n"
+    "elapsed = time.perf_counter() - started\n"
+    f"leaked = [name for name in {CLI_ONLY_MODULES!r} if name in sys.modules]\n"
+    "print(elapsed, *leaked)\n"
+  )
+  output: List[str] = run(
+    [executable, "-c", script], capture_output=True, check=True, text=True
+  ).stdout.split()
+  return float(output[0]), output[1:]
+
+
+def measure() -> Dict[str, float]:
+  """Median cold import milliseconds per statement; raises if CLI-only modules leak in"""
+  results: Dict[str, float] = {}
+  for name, statement in STATEMENTS.items():
+    timings: List[float] = []
+    leaked: List[str] = []
+    for _ in range(ROUNDS):
+      elapsed, leaked = cold_import(statement)
+      timings.append(elapsed)
+    if leaked:
+      raise RuntimeError(f"{statement!r} loads CLI-only modules: {', '.join(leaked)}")
+    results[name] = median(timings) * 1000
+  return results
+
+
+def main() -> int:
+  try:
+    report(measure())
+  except RuntimeError as error:
+    print(f"✗ {error}")
+    return 1
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
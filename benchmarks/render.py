@@ -0,0 +1,103 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/benchmarks/render.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-28 19:20
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION: Render throughput of `RizzleTemplates` with the Vite helpers in both modes
+#
+# HISTORY:
+# *************************************************************
+
+### Standard packages ###
+from json import dump
+from os import makedirs, path
+from sys import exit
+from tempfile import TemporaryDirectory
+from typing import Any, Dict, List, Optional, Tuple
+
+### Third-party packages ###
+from starlette.requests import Request
+
+### Local modules ###
+from common import report, timed
+from rizzler import Rizzler, RizzleTemplates
+
+RENDERS: int = 2000
+ROUNDS: int = 5
+TEMPLATE: str = """<!DOCTYPE html>
+<html>
+  <head>
+    <title>{{ title }}</title>
+    {{ vite_hmr_client() }}
+    {{ vite_asset("pages/main.js") }}
+  </head>
+  <body>
+    <ul>{% for item in items %}<li>{{ item }}</li>{% endfor %}</ul>
+  </body>
+</html>
+"""
+
+
+def configure(mode: str, manifest_path: str) -> None:
+  @Rizzler.load_config
+  def rizzler_settings() -> List[Tuple[str, str]]:  # type: ignore
+    return [("manifest_path", manifest_path), ("mode", mode), ("static_url", "/static/")]
+
+
+def render_many(
+  templates: RizzleTemplates, context: Dict[str, Any], cache_context: Optional[Dict[str, Any]]
+) -> None:
+  for _ in range(RENDERS):
+    templates.TemplateResponse(
+      context["request"], "index.html", context, cache_context=cache_context
+    )
+
+
+def measure() -> Dict[str, float]:
+  results: Dict[str, float] = {}
+  request: Request = Request({"type": "http", "headers": [], "method": "GET", "path": "/"})
+  with TemporaryDirectory() as workspace:
+    makedirs(path.join(workspace, "templates"))
+    makedirs(path.join(workspace, "dist", ".vite"))
+    with open(path.join(workspace, "templates", "index.html"), "w") as file:
+      file.write(TEMPLATE)
+    manifest_path: str = path.join(workspace, "dist", ".vite", "manifest.json")
+    with open(manifest_path, "w") as file:
+      dump(
+        {
+          "pages/main.js": {
+            "css": ["assets/main-BRTx1BLk.css"],
+            "file": "assets/main-DiwrgTda.js",
+            "imports": ["_vendor-C4ATuSH0.js"],
+            "isEntry": True,
+            "src": "pages/main.js",
+          },
+          "_vendor-C4ATuSH0.js": {"file": "assets/vendor-C4ATuSH0.js"},
+        },
+        file,
+      )
+    context: Dict[str, Any] = {"items": list(range(20)), "request": request, "title": "Rizzler"}
+    for mode in ("development", "production"):
+      configure(mode, manifest_path)
+      templates: RizzleTemplates = RizzleTemplates(path.join(workspace, "templates"))
+      elapsed: float = timed(ROUNDS, render_many, templates, context, None)
+      results[f"render_{mode}_per_s"] = RENDERS / elapsed
+      cached: RizzleTemplates = RizzleTemplates(
+        path.join(workspace, "templates"), response_cache_size=16
+      )
+      cache_context: Dict[str, Any] = {"items": context["items"], "title": context["title"]}
+      elapsed = timed(ROUNDS, render_many, cached, context, cache_context)
+      results[f"render_{mode}_cached_per_s"] = RENDERS / elapsed
+    configure("development", "dist/.vite/manifest.json")
+  return results
+
+
+def main() -> int:
+  report(measure())
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/benchmarks/run.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-28 20:31
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION: Runs every benchmark offline and stores results as JSON for comparison across commits
+#
+# HISTORY:
+# *************************************************************
+
+### Standard packages ###
+from argparse import ArgumentParser, Namespace
+from datetime import datetime, timezone
+from importlib import import_module
+from json import dump, load
+from os import makedirs, path
+from platform import platform, python_version
+from subprocess import CalledProcessError, run
+from sys import exit
+from typing import Any, Dict, List, Optional
+
+### Local modules ###
+from common import report
+
+BENCHMARKS: List[str] = ["import_time", "render", "html_rewriter", "vite_config", "serve"]
+RESULTS_DIRECTORY: str = path.join(path.dirname(path.abspath(__file__)), "results")
+
+
+def commit() -> Optional[str]:
+  try:
+    return run(
+      ["git", "rev-parse", "HEAD"], capture_output=True, check=True, text=True
+    ).stdout.strip()
+  except (CalledProcessError, FileNotFoundError):
+    return None
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline_path: str) -> None:
+  """Prints each metric next to its baseline value and the ratio between them"""
+  with open(baseline_path) as file:
+    baseline: Dict[str, Dict[str, float]] = load(file)["results"]
+  for benchmark, metrics in results.items():
+    for name, value in metrics.items():
+      previous: Optional[float] = baseline.get(benchmark, {}).get(name)
+      if previous is None:
+        continue
+      ratio: float = value / previous if previous else float("inf")
+      print(f"{benchmark}.{name:<48} {previous:12.3f} → {value:12.3f}  ({ratio:5.2f}x)")
+
+
+def main() -> int:
+  parser: ArgumentParser = ArgumentParser(description="Run rizzler benchmarks into JSON results")
+  parser.add_argument("--compare", help="previous results JSON to compare against")
+  parser.add_argument("--output", help="path of results JSON; defaults to results/<commit>.json")
+  parser.add_argument("benchmarks", help=", ".join(BENCHMARKS), metavar="benchmark", nargs="*")
+  arguments: Namespace = parser.parse_args()
+  for unknown in set(arguments.benchmarks) - set(BENCHMARKS):
+    parser.error(f"unknown benchmark {unknown!r}")
+  revision: Optional[str] = commit()
+  results: Dict[str, Dict[str, float]] = {}
+  for benchmark in arguments.benchmarks or BENCHMARKS:
+    print(f"### {benchmark} ###")
+    results[benchmark] = import_module(benchmark).measure()
+    report(results[benchmark])
+  document: Dict[str, Any] = {
+    "commit": revision,
+    "created": datetime.now(timezone.utc).isoformat(),
+    "platform": platform(),
+    "python": python_version(),
+    "results": results,
+  }
+  output: str = arguments.output or path.join(RESULTS_DIRECTORY, f"{revision or 'worktree'}.json")
+  makedirs(path.dirname(output) or ".", exist_ok=True)
+  with open(output, "w") as file:
+    dump(document, file, indent=2, sort_keys=True)
+  print(f"Results written to {output}")
+  if arguments.compare:
+    compare(results, arguments.compare)
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/benchmarks/serve.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-28 20:03
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION: Spawn-to-ready and shutdown latency of `Rizzler.serve` against a stand-in dev-server
+#
+# HISTORY:
+# *************************************************************
+
+### Standard packages ###
+from asyncio import run
+from os import chdir, chmod, environ, getcwd, makedirs, path, pathsep
+from statistics import median
+from sys import exit
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import Dict, List, Optional, Tuple
+
+### Local modules ###
+from common import report
+from rizzler import Rizzler
+
+FAKE_DEV_SERVER: str = """#!/bin/sh
+# Stand-in for `pnpm run dev`: announces readiness the way Vite does, then idles until signalled
+echo "  VITE v5.3.3  ready in 1 ms"
+exec sleep 3600
+"""
+ROUNDS: int = 10
+
+
+async def serve_once() -> Tuple[float, float]:
+  """Seconds from spawn to ready and from shutdown until the whole process group has exited"""
+  await Rizzler.serve(wait=True, timeout=10.0)
+  ready: Optional[float] = Rizzler.startup_latency()
+  assert ready is not None and Rizzler._process is not None
+  started: float = perf_counter()
+  Rizzler.shutdown()
+  await Rizzler._process.wait()
+  return ready, perf_counter() - started
+
+
+def measure() -> Dict[str, float]:
+  @Rizzler.load_config
+  def rizzler_settings() -> List[Tuple[str, str]]:  # type: ignore
+    return [("command", "pnpm"), ("logger_name", "rzl")]
+
+  cwd: str = getcwd()
+  search_path: str = environ["PATH"]
+  ready: List[float] = []
+  shutdown: List[float] = []
+  with TemporaryDirectory() as workspace:
+    makedirs(path.join(workspace, "bin"))
+    runner: str = path.join(workspace, "bin", "pnpm")
+    with open(runner, "w") as file:
+      file.write(FAKE_DEV_SERVER)
+    chmod(runner, 0o755)
+    environ["PATH"] = path.join(workspace, "bin") + pathsep + search_path
+    chdir(workspace)
+    try:
+      for _ in range(ROUNDS):
+        ready_latency, shutdown_latency = run(serve_once())
+        ready.append(ready_latency)
+        shutdown.append(shutdown_latency)
+    finally:
+      chdir(cwd)
+      environ["PATH"] = search_path
+  return {
+    "serve_spawn_to_ready_ms": median(ready) * 1000,
+    "serve_shutdown_ms": median(shutdown) * 1000,
+  }
+
+
+def main() -> int:
+  report(measure())
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/benchmarks/vite_config.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-28 19:41
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION: Time taken by `rizzify_vite_config` on progressively larger `vite.config.js` files
+#
+# HISTORY:
+# *************************************************************
+
+### Standard packages ###
+from os import chdir, getcwd
+from sys import exit
+from tempfile import TemporaryDirectory
+from typing import Dict, Tuple
+
+### Local modules ###
+from common import report, timed
+from rizzler.commands.initiate import rizzify_vite_config
+
+DEFINES: Tuple[int, ...] = (10, 1000, 20000)
+ROUNDS: int = 5
+
+
+def vite_config(defines: int) -> str:
+  entries: str = "".join(
+    f"    __FLAG_{index}__: JSON.stringify({index}),\n" for index in range(defines)
+  )
+  return (
+    "import { defineConfig } from 'vite'\n"
+    "import vue from '@vitejs/plugin-vue'\n\n"
+    "export default defineConfig({\n"
+    "  plugins: [vue()],\n"
+    f"  define: {{\n{entries}  }},\n"
+    "})\n"
+  )
+
+
+def rizzify(content: str) -> None:
+  with open("vite.config.js", "w") as file:
+    file.write(content)
+  rizzify_vite_config("vue")
+
+
+def measure() -> Dict[str, float]:
+  results: Dict[str, float] = {}
+  cwd: str = getcwd()
+  with TemporaryDirectory() as workspace:
+    chdir(workspace)
+    try:
+      for defines in DEFINES:
+        content: str = vite_config(defines)
+        elapsed: float = timed(ROUNDS, rizzify, content)
+        results[f"rizzify_vite_config_{defines}_defines_ms"] = elapsed * 1000
+    finally:
+      chdir(cwd)
+  return results
+
+
+def main() -> int:
+  report(measure())
+  return 0
+
+
+if __name__ == "__main__":
+  exit(main())
@@ -7,8 +7,16 @@ import react from '@vitejs/plugin-react'
 // https://vitejs.dev/config/
 export default defineConfig({
   build: {
+    manifest: true,
     rollupOptions: {
-      input: path.resolve(__dirname, './pages/main.jsx')
+      input: process.env.RIZZLER_ENTRIES
+        ? JSON.parse(process.env.RIZZLER_ENTRIES)
+        : path.resolve(__dirname, './pages/main.jsx'),
+      output: {
+        assetFileNames: 'assets/[name]-[hash].[ext]',
+        chunkFileNames: 'assets/chunks/[name]-[hash].js',
+        entryFileNames: 'assets/[name]-[hash].js'
+      }
     }
   },
   plugins: [react()],
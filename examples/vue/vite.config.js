@@ -6,8 +6,16 @@ import vue from '@vitejs/plugin-vue'
 
 export default defineConfig({
   build: {
+    manifest: true,
     rollupOptions: {
-      input: path.resolve(__dirname, './pages/main.js')
+      input: process.env.RIZZLER_ENTRIES
+        ? JSON.parse(process.env.RIZZLER_ENTRIES)
+        : path.resolve(__dirname, './pages/main.js'),
+      output: {
+        assetFileNames: 'assets/[name]-[hash].[ext]',
+        chunkFileNames: 'assets/chunks/[name]-[hash].js',
+        entryFileNames: 'assets/[name]-[hash].js'
+      }
     }
   },
   plugins: [vue()],
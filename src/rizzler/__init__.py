@@ -13,22 +13,44 @@
 
 __version__ = "0.1.8"
 
-### Third-party packages ###
-from click import group
+### Standard packages ###
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict
 
 ### Local modules ###
 from rizzler.core import Rizzler
-from rizzler.commands import build, clean, initiate
-from rizzler.templating import RizzleTemplates
 
-
-@group
-def cli() -> None:
-  """rzl"""
-
-
-cli.add_command(build, "build")
-cli.add_command(clean, "clean")
-cli.add_command(initiate, "initiate")
-
-__all__ = ("RizzleTemplates", "Rizzler", "cli")
+if TYPE_CHECKING:
+  from rizzler.commands import cli
+  from rizzler.early_hints import EarlyHintsMiddleware
+  from rizzler.metrics import Metrics, MetricsEndpoint
+  from rizzler.staticfiles import RizzleStaticFiles
+  from rizzler.templating import RizzleTemplates
+
+### Attributes resolved on first access to keep click, rich and tree-sitter out of ASGI workers ###
+LAZY_ATTRIBUTES: Dict[str, str] = {
+  "EarlyHintsMiddleware": "rizzler.early_hints",
+  "Metrics": "rizzler.metrics",
+  "MetricsEndpoint": "rizzler.metrics",
+  "RizzleStaticFiles": "rizzler.staticfiles",
+  "RizzleTemplates": "rizzler.templating",
+  "cli": "rizzler.commands",
+}
+
+
+def __getattr__(name: str) -> Any:
+  if name in LAZY_ATTRIBUTES:
+    globals()[name] = getattr(import_module(LAZY_ATTRIBUTES[name]), name)
+    return globals()[name]
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = (
+  "EarlyHintsMiddleware",
+  "Metrics",
+  "MetricsEndpoint",
+  "RizzleStaticFiles",
+  "RizzleTemplates",
+  "Rizzler",
+  "cli",
+)
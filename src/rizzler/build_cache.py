@@ -0,0 +1,158 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/build_cache.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-22 16:52
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing `BuildCache` for skipping `rzl build` when its inputs are unchanged"""
+
+### Standard packages ###
+from hashlib import sha256
+from os import link, listdir, path, replace, utime, walk
+from shutil import copy2, copytree, rmtree
+from typing import Iterable, List, Optional, Tuple
+
+BUILD_INPUTS: Tuple[str, ...] = (
+  "bun.lockb",
+  "bun.lock",
+  "deno.json",
+  "deno.lock",
+  "package-lock.json",
+  "package.json",
+  "pages",
+  "pnpm-lock.yaml",
+  "public",
+  "templates",
+  "vite.config.js",
+  "yarn.lock",
+)
+INSTALL_INPUTS: Tuple[str, ...] = (
+  "bun.lockb",
+  "bun.lock",
+  "deno.json",
+  "deno.lock",
+  "package-lock.json",
+  "package.json",
+  "pnpm-lock.yaml",
+  "yarn.lock",
+)
+LOCKFILES: Tuple[str, ...] = (
+  "bun.lockb",
+  "bun.lock",
+  "deno.lock",
+  "package-lock.json",
+  "pnpm-lock.yaml",
+  "yarn.lock",
+)
+
+MUTABLE_FILES: Tuple[str, ...] = (
+  ".modules.yaml",
+  ".package-lock.json",
+  ".yarn-integrity",
+  ".yarn-state.yml",
+  "_metadata.json",
+  "manifest.json",
+  "ssr-manifest.json",
+)
+
+
+def link_or_copy(source: str, destination: str) -> str:
+  """
+  Hard-links `source` to `destination`, copying instead across devices or without support.
+  Small files that package managers and Vite rewrite in place, listed in `MUTABLE_FILES`, are
+  always copied, since a write through a hard link would also change the cached snapshot.
+
+  ---
+  """
+  if path.basename(source) in MUTABLE_FILES:
+    copy2(source, destination)
+    return destination
+  try:
+    link(source, destination)
+  except OSError:
+    copy2(source, destination)
+  return destination
+
+
+class BuildCache(object):
+  """
+  Snapshots of `dist` keyed by a content hash over the build inputs in the project directory.
+  Snapshots are stored and restored with hard links where the filesystem allows and symbolic
+  links are kept as links, so the same store also holds `node_modules` keyed by `INSTALL_INPUTS`.
+  """
+
+  def __init__(
+    self,
+    directory: str = ".rizzler/build",
+    inputs: Iterable[str] = BUILD_INPUTS,
+    keep: int = 5,
+  ) -> None:
+    self.directory: str = directory
+    self.inputs: Tuple[str, ...] = tuple(inputs)
+    self.keep: int = keep
+
+  def key(self, *salts: str) -> str:
+    """Digest over relative paths and contents of every existing input, plus given salts"""
+    digest = sha256()
+    for salt in salts:
+      digest.update(salt.encode("utf-8") + b"\0")
+    for target in sorted(self.inputs):
+      files: List[str] = []
+      if path.isdir(target):
+        for root, directories, filenames in walk(target):
+          directories.sort()
+          files.extend(path.join(root, filename) for filename in sorted(filenames))
+      elif path.isfile(target):
+        files.append(target)
+      for file_path in files:
+        digest.update(file_path.replace(path.sep, "/").encode("utf-8") + b"\0")
+        with open(file_path, "rb") as file:
+          while chunk := file.read(1 << 20):
+            digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+  def lookup(self, key: str) -> Optional[str]:
+    snapshot: str = path.join(self.directory, key)
+    return snapshot if path.isdir(snapshot) else None
+
+  def prune(self) -> None:
+    if not path.isdir(self.directory):
+      return
+    snapshots: List[str] = sorted(
+      (path.join(self.directory, name) for name in listdir(self.directory)),
+      key=path.getmtime,
+      reverse=True,
+    )
+    for stale in snapshots[self.keep :]:
+      rmtree(stale, ignore_errors=True)
+
+  def restore(self, key: str, destination: str = "dist") -> bool:
+    snapshot: Optional[str] = self.lookup(key)
+    if snapshot is None:
+      return False
+    if path.exists(destination):
+      rmtree(destination)
+    copytree(snapshot, destination, symlinks=True, copy_function=link_or_copy)
+    utime(snapshot)
+    return True
+
+  def store(self, key: str, source: str = "dist") -> str:
+    snapshot: str = path.join(self.directory, key)
+    staging: str = f"{ snapshot }.tmp"
+    if path.exists(staging):
+      rmtree(staging)
+    copytree(source, staging, symlinks=True, copy_function=link_or_copy)
+    if path.exists(snapshot):
+      rmtree(snapshot)
+    replace(staging, snapshot)
+    self.prune()
+    return snapshot
+
+
+__all__ = ("BUILD_INPUTS", "INSTALL_INPUTS", "LOCKFILES", "MUTABLE_FILES", "BuildCache")
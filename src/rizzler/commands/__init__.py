@@ -10,9 +10,34 @@
 # HISTORY:
 # *************************************************************
 
+### Standard packages ###
+from importlib import import_module
+from typing import Any, Dict
+
+### Third-party packages ###
+from click import group
+
 ### Local modules ###
-from rizzler.commands.build import build
-from rizzler.commands.clean import clean
-from rizzler.commands.initiate import initiate
+from rizzler.types import LazyGroup
+
+SUBCOMMANDS: Dict[str, str] = {
+  "build": "rizzler.commands:build",
+  "clean": "rizzler.commands:clean",
+  "initiate": "rizzler.commands:initiate",
+  "install": "rizzler.commands:install",
+}
+
+
+@group(cls=LazyGroup, lazy_subcommands=SUBCOMMANDS)
+def cli() -> None:
+  """rzl"""
+
+
+def __getattr__(name: str) -> Any:
+  if name in SUBCOMMANDS:
+    globals()[name] = getattr(import_module(f"{__name__}.{name}"), name)
+    return globals()[name]
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ("build", "clean", "initiate")
+__all__ = ("build", "clean", "cli", "initiate", "install")
@@ -11,20 +11,42 @@
 # *************************************************************
 
 ### Standard packages ###
-from asyncio import run
+from asyncio import AbstractEventLoop, Event, gather, get_running_loop, run
+from concurrent.futures import ThreadPoolExecutor
 from logging import Formatter, Logger, getLogger
-from re import match, sub
-from typing import Dict, List, Tuple
+from functools import partial
+from json import dumps
+from os import environ, makedirs, path, remove
+from shutil import copy2, rmtree
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
 ### Third-party packages ###
-from click import command, option
+from click import ClickException, command, option
 from rich.logging import RichHandler
-from tree_sitter import Language, Parser
-from tree_sitter_html import language
 
 ### Local modules ###
+from rizzler import __version__
+from rizzler.build_cache import BuildCache
 from rizzler.core import Rizzler
+from rizzler.html_rewriter import (
+  INLINE_CSS_LIMIT,
+  TEMPLATE_EXTENSIONS,
+  ManifestResolver,
+  Resolver,
+  discover_entries,
+  rewrite_file,
+  rewrite_templates,
+)
+from rizzler.metrics import Metrics
+from rizzler.runtime import detect_runner
+from rizzler.staticfiles import precompress, precompress_file
+from rizzler.staticfiles.precompress import ENCODING_SUFFIXES
+from rizzler.supervisor import Supervisor
+from rizzler.templating import BYTECODE_CACHE_DIRECTORY, RizzleTemplates
 from rizzler.types import MutexOption
+from rizzler.watcher import Watcher
+
+PHASE_SECONDS: str = "rizzler_build_phase_seconds"
 
 
 @command
@@ -34,16 +56,42 @@ from rizzler.types import MutexOption
 @option(
   "--deno", alternatives=["bun", "npm", "pnpm", "yarn"], cls=MutexOption, is_flag=True, type=bool
 )
+@option("--force", help="Ignore cached build output and always run the full build.", is_flag=True)
+@option(
+  "--metrics",
+  help="Write per-phase build timings to this path in Prometheus text format.",
+  type=str,
+)
 @option(
   "--npm", alternatives=["bun", "deno", "pnpm", "yarn"], cls=MutexOption, is_flag=True, type=bool
 )
+@option(
+  "--optimize",
+  help="Inline small CSS, add Subresource Integrity hashes and minify rewritten templates.",
+  is_flag=True,
+)
 @option(
   "--pnpm", alternatives=["bun", "deno", "npm", "yarn"], cls=MutexOption, is_flag=True, type=bool
 )
+@option(
+  "--watch",
+  help="Keep one Vite build running and redo only what changed in pages, public or templates.",
+  is_flag=True,
+)
 @option(
   "--yarn", alternatives=["bun", "deno", "npm", "pnpm"], cls=MutexOption, is_flag=True, type=bool
 )
-def build(bun: bool, deno: bool, npm: bool, pnpm: bool, yarn: bool) -> None:
+def build(
+  bun: bool,
+  deno: bool,
+  force: bool,
+  metrics: Optional[str],
+  npm: bool,
+  optimize: bool,
+  pnpm: bool,
+  watch: bool,
+  yarn: bool,
+) -> None:
   """Build project"""
   command_selector: Dict[str, bool] = {
     "bun": bun,
@@ -53,63 +101,200 @@ def build(bun: bool, deno: bool, npm: bool, pnpm: bool, yarn: bool) -> None:
     "yarn": yarn,
   }
   command: str
+  settings: List[Tuple[str, str]] = [("logger_name", "rzl")]
   try:
     command = next(filter(lambda value: value[1], command_selector.items()))[0]
+    settings.append(("command", command))
   except StopIteration:
-    command = "pnpm"
+    command = detect_runner()  # left unconfigured so plain `vite` scripts may skip the runner
 
   @Rizzler.load_config
   def rizzler_settings() -> List[Tuple[str, str]]:  # type: ignore
-    return [("command", command), ("logger_name", "rzl")]
+    return settings
 
   logger: Logger = getLogger("rzl")
   logger.setLevel("INFO")
   handler: RichHandler = RichHandler()
   handler.setFormatter(Formatter("%(message)s", datefmt="[%X]"))
   logger.addHandler(handler)
-  run(Rizzler.build())
-
-  ### Tailor dist/index.html to be entry point ###
-  html: Language = Language(language())
-  parser: Parser = Parser(html)
-  content: bytes
-  overwrite: bytes = b""
-  with open("templates/index.html", "rb") as file:
-    content = file.read()
-  tree = parser.parse(content, encoding="utf8")
-  root_node = tree.root_node
-  doctype_node = next(filter(lambda node: node.type == "doctype", root_node.children))
-  overwrite += content[doctype_node.start_byte : doctype_node.end_byte]
-  html_node = next(filter(lambda node: node.type == "element", root_node.children))
-  cursor = html_node.walk()
-  cursor.goto_first_child()
-  while cursor.goto_next_sibling() and cursor.node is not None:
-    if (
-      match(r"^\<head\>", content[cursor.node.start_byte : cursor.node.end_byte].decode("utf8"))
-      is not None
-    ):
-      head_tag: bytes = content[cursor.node.start_byte : cursor.node.end_byte]
-      end_index: int = head_tag.decode("utf8").rindex(r"</head>")
-      overwrite += content[cursor.node.start_byte : cursor.node.start_byte + end_index]
-      overwrite += b'<link href="./rizz.css" rel="stylesheet">\n'
-      overwrite += content[cursor.node.start_byte + end_index : cursor.node.end_byte]
-    elif (
-      match(r"^\<body\>", content[cursor.node.start_byte : cursor.node.end_byte].decode("utf8"))
-      is not None
-    ):
-      body_tag: bytes = content[cursor.node.start_byte : cursor.node.end_byte]
-      end_index: int = body_tag.decode("utf8").rindex(r"</body>")
-      overwrite += content[cursor.node.start_byte : cursor.node.start_byte + end_index]
-      overwrite += b'<script language="javascript" src="./rizz.js" type="module"></script>'
-      overwrite += content[cursor.node.start_byte + end_index : cursor.node.end_byte]
-  overwrite = sub(r"\{\{\s*vite_hmr_client\(\)\s*\}\}\n", "", overwrite.decode("utf8")).encode(
-    "utf8"
+  if metrics:
+    Metrics.enable()
+  try:
+    if watch:
+      run(watch_phases(optimize, logger))
+    else:
+      build_phases(command, force, optimize, logger)
+  except FileNotFoundError as error:
+    raise ClickException(str(error)) from error
+  except KeyboardInterrupt:
+    logger.info("Stopped watching for changes.")
+  finally:
+    if metrics:
+      with open(metrics, "w", encoding="utf-8") as file:
+        file.write(Metrics.render())
+      logger.info(f"Wrote build metrics to '{ metrics }'.")
+
+
+def export_entries(logger: Logger) -> List[str]:
+  """Discovers entry points from './templates' and hands them to Vite through the environment"""
+  entries: List[str] = discover_entries("templates")
+  if entries:
+    environ["RIZZLER_ENTRIES"] = dumps({path.splitext(entry)[0]: f"./{entry}" for entry in entries})
+  logger.info(f"Discovered {len(entries)} entry point(s) from './templates'.")
+  return entries
+
+
+def resolver(optimize: bool) -> Optional[Resolver]:
+  """`ManifestResolver` over the current Vite manifest, or None until Vite has written one"""
+  if not path.isfile(Rizzler._manifest_path):
+    return None
+  return ManifestResolver(
+    Rizzler._manifest_path,
+    Rizzler._static_url,
+    inline_css_limit=INLINE_CSS_LIMIT if optimize else 0,
+    integrity=optimize,
+  )
+
+
+def rewrite_stage(optimize: bool, logger: Logger) -> None:
+  """Rewrites every template against the current manifest, then precompresses './dist'"""
+  ### Rewrite templates into production entry points ###
+  resolve: Optional[Resolver] = resolver(optimize)
+  if resolve is not None:
+    with Metrics.timer(PHASE_SECONDS, phase="rewrite"):
+      rewritten: List[Tuple[str, bool]] = rewrite_templates(
+        "templates", "dist", resolve, minify=optimize
+      )
+    logger.info(f"Rewrote {len(rewritten)} template(s) from './templates' into './dist'.")
+  else:
+    logger.warning(f"No Vite manifest at '{Rizzler._manifest_path}'; templates were not rewritten.")
+
+  ### Precompress build output for RizzleStaticFiles ###
+  with Metrics.timer(PHASE_SECONDS, phase="precompress"):
+    compressed: List[str] = precompress("dist")
+  logger.info(f"Precompressed {len(compressed)} '.br'/'.gz' siblings under './dist'.")
+
+
+def sync_file(source: str, target: str, write: Callable[[str, str], object]) -> None:
+  """Replaces `target` and its compressed siblings with `write(source, target)`, or drops them"""
+  for stale in (target, *(target + suffix for suffix in ENCODING_SUFFIXES.values())):
+    if path.lexists(stale):
+      remove(stale)  # unlink rather than truncate, in case of hard links into a cache
+  if path.isfile(source):
+    makedirs(path.dirname(target) or ".", exist_ok=True)
+    write(source, target)
+    precompress_file(target)
+
+
+def changed_templates(changes: Set[str]) -> List[str]:
+  return sorted(
+    change
+    for change in changes
+    if not path.relpath(change, "templates").startswith("..")
+    and path.splitext(change)[1] in TEMPLATE_EXTENSIONS
+  )
+
+
+def sync_changes(changes: Set[str], optimize: bool, logger: Logger) -> None:
+  """Rewrites changed templates and mirrors changed public files into './dist'"""
+  templates: List[str] = changed_templates(changes)
+  resolve: Optional[Resolver] = resolver(optimize)
+  if templates and resolve is not None:
+    with Metrics.timer(PHASE_SECONDS, phase="rewrite"):
+      for template in templates:
+        sync_file(
+          template,
+          path.join("dist", path.relpath(template, "templates")),
+          partial(rewrite_file, resolve=resolve, minify=optimize),
+        )
+        logger.info(f"Rewrote '{ template }' into './dist'.")
+  for public in sorted(change for change in changes if change not in templates):
+    if path.relpath(public, "public").startswith(".."):
+      continue
+    sync_file(public, path.join("dist", path.relpath(public, "public")), copy2)
+    logger.info(f"Mirrored '{ public }' into './dist'.")
+
+
+async def watch_phases(optimize: bool, logger: Logger) -> None:
+  """
+  Keeps one `vite build --watch` running, which rebuilds incrementally on changes under './pages',
+  and rewrites every template whenever it completes a build. Debounced changes under './public'
+  and './templates' only mirror or rewrite the files that changed; Vite is restarted only when
+  templates add or remove entry points. Rewrites and compression run one at a time on a worker
+  thread, so Vite's output and file events keep being read meanwhile.
+
+  ---
+  """
+  if path.exists("dist"):
+    rmtree("dist")  # may hold hard links into the cache; never write through them
+  entries: List[str] = export_entries(logger)
+  built: Event = Event()
+  loop: AbstractEventLoop = get_running_loop()
+  executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+  supervisor: Supervisor = await Rizzler.build_watch(built)
+
+  async def rewrite_after_builds() -> None:
+    while True:
+      await built.wait()
+      built.clear()
+      await loop.run_in_executor(executor, rewrite_stage, optimize, logger)
+
+  async def apply_changes() -> None:
+    nonlocal entries, supervisor
+    async for changes in Watcher(("public", "templates")).changes():
+      if changed_templates(changes):
+        discovered: List[str] = await loop.run_in_executor(executor, discover_entries, "templates")
+        if discovered != entries:
+          logger.info("Entry points changed; restarting Vite build.")
+          await supervisor.stop_async()
+          entries = await loop.run_in_executor(executor, export_entries, logger)
+          supervisor = await Rizzler.build_watch(built)
+          continue  # every template is rewritten once the new build completes
+      await loop.run_in_executor(executor, sync_changes, changes, optimize, logger)
+
+  try:
+    await gather(rewrite_after_builds(), apply_changes())
+  finally:
+    await supervisor.stop_async()
+    executor.shutdown(wait=False)
+
+
+def build_phases(command: str, force: bool, optimize: bool, logger: Logger) -> None:
+  """
+  Runs each stage of `rzl build`, observing its duration into `rizzler_build_phase_seconds`
+  when `Metrics` is enabled.
+
+  ---
+  """
+  ### Precompile templates into the shared Jinja bytecode cache ###
+  templates: RizzleTemplates = RizzleTemplates(
+    "templates", bytecode_cache_directory=BYTECODE_CACHE_DIRECTORY
   )
-  overwrite = sub(
-    r"\{\{\s*vite_asset\((\"|')pages\/main\.js[x]?(\"|')\)\s*\}\}\n", "", overwrite.decode("utf8")
-  ).encode("utf8")
-  with open("dist/index.html", "wb") as file:
-    file.write(overwrite)
+  with Metrics.timer(PHASE_SECONDS, phase="precompile"):
+    compiled, failures = templates.precompile()
+  for name, error in failures.items():
+    logger.error(f"Failed to compile template '{name}': {error}")
+  logger.info(f"Precompiled {len(compiled)} template(s) into '{BYTECODE_CACHE_DIRECTORY}'.")
+
+  ### Restore dist from build cache when inputs are unchanged ###
+  cache: BuildCache = BuildCache()
+  with Metrics.timer(PHASE_SECONDS, phase="cache_restore"):
+    key: str = cache.key(command, __version__, "optimize" if optimize else "")
+    restored: bool = not force and cache.restore(key)
+  if restored:
+    logger.info(f"Restored './dist' from build cache { key[:12] }; skipping build.")
+    return
+  if path.exists("dist"):
+    rmtree("dist")  # may hold hard links into the cache; never write through them
+  export_entries(logger)
+  with Metrics.timer(PHASE_SECONDS, phase="vite_build"):
+    returncode, _, _ = run(Rizzler.build())
+  rewrite_stage(optimize, logger)
+
+  if returncode == 0:
+    with Metrics.timer(PHASE_SECONDS, phase="cache_store"):
+      cache.store(key)
+    logger.info(f"Stored './dist' in build cache { key[:12] }.")
 
 
 __all__ = ("build",)
@@ -12,40 +12,91 @@
 
 ### Standard packages ###
 from logging import Formatter, Logger, getLogger
-from shutil import rmtree
-from os import path, remove
+from os import path
+from typing import Dict, List, Tuple
 
 ### Third-party packages ###
-from click import command
+from click import command, option
 from rich.logging import RichHandler
 
+### Local modules ###
+from rizzler.build_cache import LOCKFILES
+from rizzler.trash import TreeSize, empty_trash, empty_trash_detached, move_to_trash, walk
+
+CLEAN_TARGETS: Dict[str, Tuple[str, ...]] = {
+  "caches": (".rizzler/build", ".rizzler/jinja", ".rizzler/node_modules"),
+  "config": ("package.json", "vite.config.js"),
+  "dist": ("dist",),
+  "lockfiles": LOCKFILES,
+  "node_modules": ("node_modules",),
+}
+DEFAULT_TARGETS: Tuple[str, ...] = ("config", "lockfiles", "node_modules")
+
+
+def human_size(size: float) -> str:
+  for unit in ("B", "KiB", "MiB", "GiB"):
+    if size < 1024 or unit == "GiB":
+      break
+    size /= 1024
+  return f"{ size:.1f} { unit }"
+
 
 @command
-def clean() -> None:
+@option("--all", "everything", help="Clean every target below.", is_flag=True)
+@option("--caches", help="Build, Jinja bytecode and 'node_modules' caches.", is_flag=True)
+@option("--config", help="'package.json' and 'vite.config.js'.", is_flag=True)
+@option("--dist", help="Build output under './dist'.", is_flag=True)
+@option("--dry-run", help="Report what would be deleted and its size.", is_flag=True)
+@option("--lockfiles", help="Lockfiles of every supported package manager.", is_flag=True)
+@option("--node-modules", help="Installed dependencies under './node_modules'.", is_flag=True)
+@option("--wait", help="Delete trashed targets before returning.", is_flag=True)
+def clean(
+  everything: bool,
+  caches: bool,
+  config: bool,
+  dist: bool,
+  dry_run: bool,
+  lockfiles: bool,
+  node_modules: bool,
+  wait: bool,
+) -> None:
   """Clean up generated files from JavaScript Runtime's package manager"""
   logger: Logger = getLogger("rzl")
   logger.setLevel("INFO")
   handler: RichHandler = RichHandler()
   handler.setFormatter(Formatter("%(message)s", datefmt="[%X]"))
   logger.addHandler(handler)
-  if path.exists("node_modules"):
-    logger.info(f"D node_modules")
-    rmtree("node_modules")
-  if path.exists("package.json"):
-    logger.info(f"D package.json")
-    remove("package.json")
-  if path.exists("package-lock.json"):
-    logger.info(f"D package-lock.json")
-    remove("package-lock.json")
-  if path.exists("pnpm-lock.yaml"):
-    logger.info(f"D pnpm-lock.yaml")
-    remove("pnpm-lock.yaml")
-  if path.exists("vite.config.js"):
-    logger.info(f"D vite.config.js")
-    remove("vite.config.js")
-  if path.exists("yarn.lock"):
-    logger.info(f"D yarn.lock")
-    remove("yarn.lock")
+  target_selector: Dict[str, bool] = {
+    "caches": caches,
+    "config": config,
+    "dist": dist,
+    "lockfiles": lockfiles,
+    "node_modules": node_modules,
+  }
+  groups: List[str] = [
+    group for group, selected in target_selector.items() if selected or everything
+  ] or list(DEFAULT_TARGETS)
+  targets: List[str] = [target for group in groups for target in CLEAN_TARGETS[group]]
+
+  ### Report sizes without deleting anything ###
+  if dry_run:
+    total: int = 0
+    for target in filter(path.lexists, targets):
+      tree: TreeSize = walk(target)
+      total += tree.size
+      logger.info(f"D { target } ({ tree.files } files, { human_size(tree.size) })")
+    logger.info(f"Would free { human_size(total) }.")
+    return
+
+  ### Rename targets into trash, then delete them in the background or in parallel ###
+  _, moved = move_to_trash(targets)
+  for target in moved:
+    logger.info(f"D { target }")
+  if not wait:
+    logger.info(f"Emptying trash in background process { empty_trash_detached() }.")
+    return
+  freed: TreeSize = empty_trash()
+  logger.info(f"Freed { human_size(freed.size) } across { freed.files } files.")
 
 
 __all__ = ("clean",)
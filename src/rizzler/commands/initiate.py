@@ -13,13 +13,13 @@
 ### Standard packages ###
 from asyncio import run
 from logging import Formatter, Logger, getLogger
-from os import path, mkdir, remove
+from os import path, mkdir, remove, replace
 from re import match, sub
-from shutil import move, rmtree
-from typing import Dict, List, Tuple
+from shutil import rmtree
+from typing import Dict, List, Optional, Tuple
 
 ### Third-party packages ###
-from click import command, option
+from click import ClickException, command, option
 from rich.logging import RichHandler
 from tree_sitter import Language, Parser
 from tree_sitter_javascript import language
@@ -27,6 +27,8 @@ from tree_sitter_javascript import language
 ### Local modules ###
 from rizzler.configs import SCRIPT, TEMPLATES
 from rizzler.core import Rizzler
+from rizzler.runtime import detect_runner
+from rizzler.scaffold_cache import ScaffoldCache
 from rizzler.types import MutexOption
 
 
@@ -41,12 +43,12 @@ def remove_if_exists(target: str) -> bool:
   return removed
 
 
-def rizzify_vite_config(framework: str) -> bool:
+def rizzify_vite_config(framework: str, config_path: str = "vite.config.js") -> bool:
   javascript: Language = Language(language())
   parser: Parser = Parser(javascript)
   content: bytes
   overwrite: bytes = b""
-  with open("vite.config.js", "rb") as file:
+  with open(config_path, "rb") as file:
     content = file.read()
   tree = parser.parse(content, encoding="utf8")
   root_node = tree.root_node
@@ -91,18 +93,22 @@ def rizzify_vite_config(framework: str) -> bool:
                     "\n",
                     """
                     build: {
+                      manifest: true,
                       rollupOptions: {
-                        input: './pages/main.%s',
+                        input: process.env.RIZZLER_ENTRIES
+                          ? JSON.parse(process.env.RIZZLER_ENTRIES)
+                          : './pages/main.%s',
                         output: {
-                          assetFileNames: 'rizz.[ext]',
-                          entryFileNames: 'rizz.js'
+                          assetFileNames: 'assets/[name]-[hash].[ext]',
+                          chunkFileNames: 'assets/chunks/[name]-[hash].js',
+                          entryFileNames: 'assets/[name]-[hash].js'
                         },
                       },
                     },"""
                     % entry_extension,
                   ).encode("utf8")
                   overwrite += content[fields_cursor.node.end_byte : len(content)]
-  with open("vite.config.js", "wb") as file:
+  with open(config_path, "wb") as file:
     file.write(overwrite)
 
   return True
@@ -127,9 +133,13 @@ def rizzify_vite_config(framework: str) -> bool:
 @option(
   "--react", alternatives=["angular", "svelte", "vue"], cls=MutexOption, is_flag=True, type=bool
 )
+@option(
+  "--refresh", help="Ignore cached scaffolds and create a fresh one from the network.", is_flag=True
+)
 @option(
   "--svelte", alternatives=["angular", "react", "vue"], cls=MutexOption, is_flag=True, type=bool
 )
+@option("--vite", help="Vite version of the cached scaffold to restore; defaults to newest.")
 @option(
   "--vue", alternatives=["angular", "react", "svelte"], cls=MutexOption, is_flag=True, type=bool
 )
@@ -143,7 +153,9 @@ def initiate(
   npm: bool,
   pnpm: bool,
   react: bool,
+  refresh: bool,
   svelte: bool,
+  vite: Optional[str],
   vue: bool,
   yarn: bool,
 ) -> None:
@@ -159,7 +171,7 @@ def initiate(
   try:
     command = next(filter(lambda value: value[1], command_selector.items()))[0]
   except StopIteration:
-    command = "pnpm"
+    command = detect_runner()
 
   framework_selector: Dict[str, bool] = {
     "angular": angular,
@@ -183,27 +195,38 @@ def initiate(
   handler.setFormatter(Formatter("%(message)s", datefmt="[%X]"))
   logger.addHandler(handler)
 
-  if not path.exists("rzl-tmp"):
-    mkdir("rzl-tmp")
-  run(Rizzler.initiate())
-  removed: bool = remove_if_exists("package.json")
-  move("rzl-tmp/package.json", "package.json")
-  logger.info(f"'./package.json' file has been {'rewritten' if removed else 'written'}.")
-  removed = remove_if_exists("vite.config.js")
-  move("rzl-tmp/vite.config.js", "vite.config.js")
-  logger.info(f"'./vite.config.js' file has been {'rewritten' if removed else 'written'}.")
-  rizzified = rizzify_vite_config(framework)
-  if rizzified:
-    logger.info("'./vite.config.js' file has been rizzified.")
-  removed = remove_if_exists("pages")
-  move("rzl-tmp/src", "pages")
-  logger.info(f"'./pages' directory has been {'recreated' if removed else 'created'}.")
-  removed = remove_if_exists("public")
-  move("rzl-tmp/public", "public")
-  logger.info(f"'./public' directory has been {'recreated' if removed else 'created'}.")
-  rmtree("rzl-tmp")
-  logger.info("Temporary directory 'rzl-tmp' has been removed.")
-  removed = remove_if_exists("templates")
+  ### Restore a rizzified scaffold from cache, creating and caching one on a miss ###
+  cache: ScaffoldCache = ScaffoldCache()
+  snapshot: Optional[str] = None if refresh else cache.lookup(framework, vite)
+  if snapshot is not None:
+    logger.info(f"Restoring '{ framework }' scaffold from cache at '{ snapshot }'.")
+  else:
+    if not path.exists("rzl-tmp"):
+      mkdir("rzl-tmp")
+    try:
+      run(Rizzler.initiate())
+    except FileNotFoundError as error:
+      raise ClickException(str(error)) from error
+    rizzified = rizzify_vite_config(framework, "rzl-tmp/vite.config.js")
+    if rizzified:
+      logger.info("'./vite.config.js' file has been rizzified.")
+    remove_if_exists("rzl-tmp/pages")
+    if path.exists("rzl-tmp/src"):
+      replace("rzl-tmp/src", "rzl-tmp/pages")
+    snapshot = cache.store(framework, "rzl-tmp")
+    if snapshot is not None:
+      logger.info(f"Scaffold has been cached at '{ snapshot }'.")
+    else:
+      logger.warning("Scaffold is incomplete or has no 'vite' dependency; it was not cached.")
+      snapshot = "rzl-tmp"
+  for entry, replaced in cache.restore(snapshot):
+    if path.isdir(entry):
+      logger.info(f"'./{ entry }' directory has been {'recreated' if replaced else 'created'}.")
+    else:
+      logger.info(f"'./{ entry }' file has been {'rewritten' if replaced else 'written'}.")
+  if remove_if_exists("rzl-tmp"):
+    logger.info("Temporary directory 'rzl-tmp' has been removed.")
+  removed: bool = remove_if_exists("templates")
   mkdir("templates")
   with open("templates/index.html", "wb") as index_html:
     index_html.write("\n".join(TEMPLATES[framework].values()).encode("utf-8"))  # type: ignore
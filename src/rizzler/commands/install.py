@@ -0,0 +1,98 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/commands/install.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-30 16:05
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+
+### Standard packages ###
+from asyncio import run
+from logging import Formatter, Logger, getLogger
+from os import path
+from platform import machine
+from shutil import rmtree
+from sys import platform
+from typing import Dict, List, Tuple
+
+### Third-party packages ###
+from click import ClickException, command, option
+from rich.logging import RichHandler
+
+### Local modules ###
+from rizzler.build_cache import INSTALL_INPUTS, LOCKFILES, BuildCache
+from rizzler.core import Rizzler
+from rizzler.runtime import detect_runner
+from rizzler.types import MutexOption
+
+
+@command
+@option(
+  "--bun", alternatives=["deno", "npm", "pnpm", "yarn"], cls=MutexOption, is_flag=True, type=bool
+)
+@option(
+  "--deno", alternatives=["bun", "npm", "pnpm", "yarn"], cls=MutexOption, is_flag=True, type=bool
+)
+@option("--force", help="Ignore cached 'node_modules' snapshots and always install.", is_flag=True)
+@option(
+  "--npm", alternatives=["bun", "deno", "pnpm", "yarn"], cls=MutexOption, is_flag=True, type=bool
+)
+@option(
+  "--pnpm", alternatives=["bun", "deno", "npm", "yarn"], cls=MutexOption, is_flag=True, type=bool
+)
+@option(
+  "--yarn", alternatives=["bun", "deno", "npm", "pnpm"], cls=MutexOption, is_flag=True, type=bool
+)
+def install(bun: bool, deno: bool, force: bool, npm: bool, pnpm: bool, yarn: bool) -> None:
+  """Install dependencies, restoring 'node_modules' from cache when the lockfile is unchanged"""
+  command_selector: Dict[str, bool] = {
+    "bun": bun,
+    "deno": deno,
+    "npm": npm,
+    "pnpm": pnpm,
+    "yarn": yarn,
+  }
+  command: str
+  try:
+    command = next(filter(lambda value: value[1], command_selector.items()))[0]
+  except StopIteration:
+    command = detect_runner()
+
+  @Rizzler.load_config
+  def rizzler_settings() -> List[Tuple[str, str]]:  # type: ignore
+    return [("command", command), ("logger_name", "rzl")]
+
+  logger: Logger = getLogger("rzl")
+  logger.setLevel("INFO")
+  handler: RichHandler = RichHandler()
+  handler.setFormatter(Formatter("%(message)s", datefmt="[%X]"))
+  logger.addHandler(handler)
+
+  ### Restore node_modules from snapshot store when the lockfile is unchanged ###
+  try:
+    lockfiles: List[str] = [lockfile for lockfile in LOCKFILES if path.isfile(lockfile)]
+    if not lockfiles:
+      logger.warning("No lockfile found; installing without the 'node_modules' cache.")
+      run(Rizzler.install())
+      return
+    cache: BuildCache = BuildCache(".rizzler/node_modules", INSTALL_INPUTS, keep=3)
+    key: str = cache.key(command, platform, machine())
+    if not force and cache.restore(key, "node_modules"):
+      logger.info(f"Restored './node_modules' from snapshot { key[:12] } of '{ lockfiles[0] }'.")
+      return
+    if path.exists("node_modules"):
+      rmtree("node_modules")  # may hold hard links into the store; never install through them
+    returncode, _, _ = run(Rizzler.install())
+    if returncode == 0 and path.isdir("node_modules"):
+      key = cache.key(command, platform, machine())  # install may have rewritten the lockfile
+      cache.store(key, "node_modules")
+      logger.info(f"Stored './node_modules' as snapshot { key[:12] }.")
+  except FileNotFoundError as error:
+    raise ClickException(str(error)) from error
+
+
+__all__ = ("install",)
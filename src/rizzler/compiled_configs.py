@@ -0,0 +1,111 @@
+# Generated by `python -m rizzler.configs`; do not edit by hand.
+SCRIPT_SHA256 = '7f2131a27b4f80cc9bf96128ea979a5ad3d83944a57372f442aa8dcd442c99f3'
+SCRIPT = ['#!/usr/bin/env python3',
+ 'from contextlib import asynccontextmanager',
+ 'from fastapi import FastAPI',
+ 'from fastapi.requests import Request',
+ 'from fastapi.responses import HTMLResponse',
+ 'from fastapi.staticfiles import StaticFiles',
+ 'from rizzler import Rizzler, RizzleTemplates',
+ 'from typing import List, Tuple',
+ '',
+ 'templates = RizzleTemplates(directory="templates")',
+ '',
+ '@Rizzler.load_config',
+ 'def rizzler_settings() -> List[Tuple[str, str]]:',
+ '  return [("framework", "react")]',
+ '',
+ '@asynccontextmanager',
+ 'async def lifespan(_: FastAPI):',
+ '  await Rizzler.serve()',
+ '  yield',
+ '  Rizzler.shutdown()',
+ '',
+ 'app = FastAPI(lifespan=lifespan)',
+ '',
+ '@app.get("/", response_class=HTMLResponse)',
+ 'def index(request: Request) -> HTMLResponse:',
+ '  return templates.TemplateResponse("index.html", {"request": request})',
+ '',
+ 'app.mount("/", StaticFiles(directory="public"), name="public")']
+TEMPLATES_SHA256 = 'ae67d82e49633e517bfbac2a5a7e4c33f4523b8b32056d3b833d8434777f5d15'
+TEMPLATES = {'base': {0: '<!DOCTYPE html>',
+          1: '<html lang="en">',
+          2: '  <head>',
+          3: '    <meta charset="UTF-8" />',
+          4: '    <meta httprime-equiv="X-UA-Compatible" content="IE=edge" />',
+          5: '    <meta name="viewport" content="width=device-width, initial-scale=1.0" />',
+          6: '    <title>',
+          7: '      Rizzler Template',
+          8: '    </title>',
+          9: '    <link href="/favicon.ico" rel="shortcut icon" type="image/x-icon">',
+          10: '    {{ vite_hmr_client() }}',
+          11: '    {{ vite_asset("pages/main.js") }}',
+          12: '  </head>',
+          13: '  <body>',
+          14: '    <noscript>',
+          15: '      This page requires JavaScript to work.',
+          16: '    </noscript>',
+          17: '    <div id="app"></div>',
+          18: '  </body>',
+          19: '</html>'},
+ 'react': {0: '<!DOCTYPE html>',
+           1: '<html lang="en">',
+           2: '  <head>',
+           3: '    <meta charset="UTF-8" />',
+           4: '    <meta httprime-equiv="X-UA-Compatible" content="IE=edge" />',
+           5: '    <meta name="viewport" content="width=device-width, initial-scale=1.0" />',
+           6: '    <title>',
+           7: '      Rizzler Template',
+           8: '    </title>',
+           9: '    <link href="/favicon.ico" rel="shortcut icon" type="image/x-icon">',
+           10: '    {{ vite_hmr_client() }}',
+           11: '    {{ vite_asset("pages/main.jsx") }}',
+           12: '  </head>',
+           13: '  <body>',
+           14: '    <noscript>',
+           15: '      This page requires JavaScript to work.',
+           16: '    </noscript>',
+           17: '    <div id="root"></div>',
+           18: '  </body>',
+           19: '</html>'},
+ 'svelte': {0: '<!DOCTYPE html>',
+            1: '<html lang="en">',
+            2: '  <head>',
+            3: '    <meta charset="UTF-8" />',
+            4: '    <meta httprime-equiv="X-UA-Compatible" content="IE=edge" />',
+            5: '    <meta name="viewport" content="width=device-width, initial-scale=1.0" />',
+            6: '    <title>',
+            7: '      Rizzler Template',
+            8: '    </title>',
+            9: '    <link href="/favicon.ico" rel="shortcut icon" type="image/x-icon">',
+            10: '    {{ vite_hmr_client() }}',
+            11: '    {{ vite_asset("pages/main.js") }}',
+            12: '  </head>',
+            13: '  <body>',
+            14: '    <noscript>',
+            15: '      This page requires JavaScript to work.',
+            16: '    </noscript>',
+            17: '    <div id="app"></div>',
+            18: '  </body>',
+            19: '</html>'},
+ 'vue': {0: '<!DOCTYPE html>',
+         1: '<html lang="en">',
+         2: '  <head>',
+         3: '    <meta charset="UTF-8" />',
+         4: '    <meta httprime-equiv="X-UA-Compatible" content="IE=edge" />',
+         5: '    <meta name="viewport" content="width=device-width, initial-scale=1.0" />',
+         6: '    <title>',
+         7: '      Rizzler Template',
+         8: '    </title>',
+         9: '    <link href="/favicon.ico" rel="shortcut icon" type="image/x-icon">',
+         10: '    {{ vite_hmr_client() }}',
+         11: '    {{ vite_asset("pages/main.js") }}',
+         12: '  </head>',
+         13: '  <body>',
+         14: '    <noscript>',
+         15: '      This page requires JavaScript to work.',
+         16: '    </noscript>',
+         17: '    <div id="app"></div>',
+         18: '  </body>',
+         19: '</html>'}}
@@ -5,34 +5,91 @@
 # VERSION:     0.1.9
 # CREATED:     2024-06-11 19:26
 # AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
-# DESCRIPTION:
+# DESCRIPTION: `SCRIPT` and `TEMPLATES` are resolved on first access, preferably from the
+#              precompiled `compiled_configs` module; run `python -m rizzler.configs` after
+#              editing either YAML file to regenerate it.
 #
 # HISTORY:
 # *************************************************************
 
 ### Standard packages ###
+from hashlib import sha256
 from pathlib import Path
+from pprint import pformat
 from typing import Any, Dict, List, Literal, Optional
 
-### Third-party packages ###
-from pydantic import TypeAdapter
-from yaml import Loader, load
-
-
 file_path: Path = Path(__file__).resolve()
+script_path: Path = file_path.with_name("script.yaml")
+templates_path: Path = file_path.with_name("templates.yaml")
+compiled_path: Path = file_path.with_name("compiled_configs.py")
 
 SCRIPT: List[str]
-with open(str(file_path).replace("configs.py", "script.yaml"), "rb") as stream:
-  script: Optional[Dict[str, Any]] = load(stream, Loader=Loader)
-  if script:
-    SCRIPT = TypeAdapter(List[str]).validate_python(script["serve"])
-
 TEMPLATES: Dict[Literal["base", "react", "svelte", "vue"], Dict[int, str]]
-with open(str(file_path).replace("configs.py", "templates.yaml"), "rb") as stream:
-  templates: Optional[Dict[str, Any]] = load(stream, Loader=Loader)
-  if templates:
-    TEMPLATES = TypeAdapter(
-      Dict[Literal["base", "react", "svelte", "vue"], Dict[int, str]]
-    ).validate_python(templates["templates"])
+
+
+def digest(source: Path) -> str:
+  return sha256(source.read_bytes()).hexdigest()
+
+
+def load_yaml(source: Path) -> Dict[str, Any]:
+  ### Third-party packages ###
+  from yaml import load
+
+  try:
+    from yaml import CLoader as Loader
+  except ImportError:
+    from yaml import Loader  # type: ignore[assignment]
+
+  with open(source, "rb") as stream:
+    content: Optional[Dict[str, Any]] = load(stream, Loader=Loader)
+  return content or {}
+
+
+def parse_script() -> List[str]:
+  ### Third-party packages ###
+  from pydantic import TypeAdapter
+
+  return TypeAdapter(List[str]).validate_python(load_yaml(script_path).get("serve", []))
+
+
+def parse_templates() -> Dict[Literal["base", "react", "svelte", "vue"], Dict[int, str]]:
+  ### Third-party packages ###
+  from pydantic import TypeAdapter
+
+  return TypeAdapter(
+    Dict[Literal["base", "react", "svelte", "vue"], Dict[int, str]]
+  ).validate_python(load_yaml(templates_path).get("templates", {}))
+
+
+def __getattr__(name: str) -> Any:
+  if name not in {"SCRIPT", "TEMPLATES"}:
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+  source: Path = script_path if name == "SCRIPT" else templates_path
+  try:
+    from rizzler import compiled_configs
+
+    if getattr(compiled_configs, f"{name}_SHA256") == digest(source):
+      globals()[name] = getattr(compiled_configs, name)
+      return globals()[name]
+  except ImportError:
+    ...
+  globals()[name] = parse_script() if name == "SCRIPT" else parse_templates()
+  return globals()[name]
+
+
+def compile_configs() -> None:
+  """Regenerates `compiled_configs.py` from the YAML sources, keyed by their SHA-256 digests"""
+  with open(compiled_path, "w", encoding="utf-8") as module:
+    module.write(
+      "# Generated by `python -m rizzler.configs`; do not edit by hand.\n"
+      f"SCRIPT_SHA256 = {digest(script_path)!r}\n"
+      f"SCRIPT = {pformat(parse_script(), width=100)}\n"
+      f"TEMPLATES_SHA256 = {digest(templates_path)!r}\n"
+      f"TEMPLATES = {pformat(parse_templates(), width=100)}\n"
+    )
+
+
+if __name__ == "__main__":
+  compile_configs()
 
 __all__ = ("SCRIPT", "TEMPLATES")
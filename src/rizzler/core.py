@@ -12,87 +12,259 @@
 """Module containing Core implementation for Rizzler extension for ASGI Frameworks"""
 
 ### Standard packages ###
-from asyncio import create_subprocess_shell, ensure_future, gather
-from asyncio.streams import StreamReader
+from asyncio import (
+  FIRST_COMPLETED,
+  Event,
+  Future,
+  create_subprocess_exec,
+  ensure_future,
+  gather,
+  open_connection,
+  sleep,
+  wait,
+)
 from asyncio.subprocess import PIPE, Process
-from logging import Logger, getLogger
-from typing import Optional, Tuple
+from logging import INFO, Logger, getLogger
+from os import path
+from time import perf_counter
+from typing import List, Optional, Set, Tuple
 
 ### Local modules ###
+from rizzler.log_pipeline import LogLine, LogPipeline
 from rizzler.rizzler_config import RizzlerConfig
+from rizzler.runtime import create_argv, detect_runner, install_argv, script_argv
+from rizzler.shared_server_lock import SharedServerLock
+from rizzler.supervisor import ResourceStats, Supervisor, terminate_group
 
 
-async def log_stderr(logger: Logger, stream: Optional[StreamReader]) -> None:
-  if stream is not None:
-    while chunk := await stream.readline():
-      logger.error(f"{chunk.decode('utf-8').strip()}")
+DEV_SERVER_HOST: str = "localhost"
+DEV_SERVER_PORT: int = 5173
 
 
-async def log_stdout(logger: Logger, stream: Optional[StreamReader]) -> None:
-  if stream is not None:
-    while chunk := await stream.readline():
-      logger.info(f"{chunk.decode('utf-8').strip()}")
+async def poll_port(host: str, port: int, interval: float = 0.1) -> None:
+  while True:
+    try:
+      _, writer = await open_connection(host, port)
+      writer.close()
+      return
+    except OSError:
+      await sleep(interval)
 
 
 class Rizzler(RizzlerConfig):
+  _lock: Optional[SharedServerLock] = None
+  _pipeline: Optional[LogPipeline] = None
   _process: Optional[Process] = None
+  _startup_latency: Optional[float] = None
+  _supervisor: Optional[Supervisor] = None
 
   @classmethod
   async def build(cls) -> Tuple[int, None, None]:
-    command: str = f"{ cls._command } run" if cls._command != "yarn" else "yarn"
     logger: Logger = getLogger(cls._logger_name)
     logger.info("⚡Building Rizzler front-end…")
-    cls._process = await create_subprocess_shell(
-      f"{ command } build", stdout=PIPE, stderr=PIPE, restore_signals=True
+    cls._process = await create_subprocess_exec(
+      *cls.script_argv("build"), stdout=PIPE, stderr=PIPE, restore_signals=True
     )
     return await gather(
       cls._process.wait(),
-      log_stdout(logger, cls._process.stdout),
-      log_stderr(logger, cls._process.stderr),
+      cls.pipeline().consume(cls._process.stdout, INFO),
+      cls.pipeline().consume(cls._process.stderr, INFO),
     )
 
+  @classmethod
+  async def build_watch(cls, built: Event) -> Supervisor:
+    """
+    Starts one long-lived `vite build --watch` that rebuilds incrementally on source changes,
+    setting `built` after every completed build, and returns its supervisor.
+
+    ---
+    """
+    logger: Logger = getLogger(cls._logger_name)
+    logger.info("⚡Building Rizzler front-end in watch mode…")
+    supervisor: Supervisor = Supervisor(
+      cls.script_argv("build", "--watch"),
+      logger,
+      LogPipeline(logger, ready_marker="built in"),
+    )
+    await supervisor.start(built)
+    return supervisor
+
   @classmethod
   async def initiate(cls) -> Tuple[int, None, None]:
     logger: Logger = getLogger(cls._logger_name)
     logger.info("⚡Initiating Rizzler…")
-    cls._process = await create_subprocess_shell(
-      f"{ cls._command } create vite@latest rzl-tmp --template { cls._framework }",
+    cls._process = await create_subprocess_exec(
+      *create_argv(cls.runner(), "vite@latest", "rzl-tmp", "--template", cls._framework),
       stdout=PIPE,
       stderr=PIPE,
       restore_signals=True,
     )
     return await gather(
       cls._process.wait(),
-      log_stdout(logger, cls._process.stdout),
-      log_stderr(logger, cls._process.stderr),
+      cls.pipeline().consume(cls._process.stdout, INFO),
+      cls.pipeline().consume(cls._process.stderr, INFO),
     )
 
   @classmethod
-  async def serve(cls) -> Process:
-    command: str = f"{ cls._command } run" if cls._command != "yarn" else "yarn"
+  async def install(cls) -> Tuple[int, None, None]:
     logger: Logger = getLogger(cls._logger_name)
-    logger.info("⚡Serving Rizzler dev-server…")
-    cls._process = await create_subprocess_shell(
-      f"{ command } dev", stdout=PIPE, stderr=PIPE, restore_signals=True
+    logger.info("⚡Installing Rizzler front-end dependencies…")
+    cls._process = await create_subprocess_exec(
+      *install_argv(cls.runner()), stdout=PIPE, stderr=PIPE, restore_signals=True
     )
-    ensure_future(
-      gather(
-        cls._process.wait(),
-        log_stdout(logger, cls._process.stdout),
-        log_stderr(logger, cls._process.stderr),
-      )
+    return await gather(
+      cls._process.wait(),
+      cls.pipeline().consume(cls._process.stdout, INFO),
+      cls.pipeline().consume(cls._process.stderr, INFO),
     )
+
+  @classmethod
+  def collect_metrics(cls) -> None:
+    """Sets dev-server gauges from the supervisor owned by this worker; runs at scrape time"""
+    ### Local modules ###
+    from rizzler.metrics import Metrics
+
+    if cls._supervisor is None:
+      return
+    uptime: Optional[float] = cls._supervisor.uptime()
+    Metrics.set("rizzler_dev_server_up", 0.0 if uptime is None else 1.0)
+    Metrics.set("rizzler_dev_server_uptime_seconds", uptime or 0.0)
+    Metrics.set("rizzler_dev_server_restarts", float(cls._supervisor.restarts))
+    stats: Optional[ResourceStats] = cls._supervisor.stats()
+    if stats is not None:
+      Metrics.set("rizzler_dev_server_cpu_percent", stats.cpu_percent)
+      Metrics.set("rizzler_dev_server_cpu_seconds", stats.cpu_seconds)
+      Metrics.set("rizzler_dev_server_rss_bytes", float(stats.rss_bytes))
+
+  @classmethod
+  def logs(cls, limit: Optional[int] = None, level: int = 0) -> List[LogLine]:
+    """Most recent lines relayed from build, initiate and dev-server subprocesses"""
+    return cls.pipeline().tail(limit, level)
+
+  @classmethod
+  def pipeline(cls) -> LogPipeline:
+    if cls._pipeline is None or cls._pipeline.logger.name != cls._logger_name:
+      cls._pipeline = LogPipeline(getLogger(cls._logger_name))
+    return cls._pipeline
+
+  @classmethod
+  async def serve(cls, wait: bool = False, timeout: float = 30.0) -> Optional[Process]:
+    """
+    Starts the Vite dev-server, unless another worker serving the same project directory already
+    owns one, in which case the current worker attaches to it and returns None. Also returns None,
+    logging an error, when the package runner is not installed.
+
+    When `wait` is set, only returns once the spawned Vite reports "ready in", or for an attached
+    worker once the shared server accepts connections on its port, raising `TimeoutError` after
+    `timeout` seconds. A stale process already listening on the port never counts as ready for
+    the worker that spawned Vite. Time to ready is exposed by `Rizzler.startup_latency`.
+
+    ---
+    """
+    logger: Logger = getLogger(cls._logger_name)
+    started: float = perf_counter()
+    ready: Event = Event()
+    cls._startup_latency = None
+    cls._lock = SharedServerLock()
+    if not cls._lock.attach():
+      logger.info("⚡Attaching to Rizzler dev-server owned by another worker…")
+      cls._process = None
+    else:
+      logger.info("⚡Serving Rizzler dev-server…")
+      try:
+        command: Tuple[str, ...] = cls.script_argv("dev")
+      except FileNotFoundError as error:
+        logger.error(f"⚡Rizzler dev-server cannot start: { error }")
+        cls._lock.detach()
+        cls._process = None
+        return None
+      cls._supervisor = Supervisor(
+        command,
+        logger,
+        cls.pipeline(),
+        log_path=path.join(cls._lock.directory, "server.log"),
+        on_spawn=cls._lock.record_server,
+      )
+      cls._process = await cls._supervisor.start(ready)
+    readiness: Future = ensure_future(cls.wait_until_ready(ready, started, timeout))
+    if wait:
+      await readiness
+    else:
+      readiness.add_done_callback(lambda future: future.cancelled() or future.exception())
     return cls._process
 
+  @classmethod
+  def runner(cls) -> str:
+    """Configured package runner, or the one whose lockfile is in the project directory"""
+    return cls._command or detect_runner()
+
+  @classmethod
+  def script_argv(cls, script: str, *arguments: str) -> Tuple[str, ...]:
+    """
+    Argv running `package.json` script `script`, straight from `node_modules/.bin` only when no
+    runner was configured, so a configured runner such as bun always runs the script itself.
+
+    ---
+    """
+    return script_argv(cls.runner(), script, *arguments, direct=not cls._command)
+
+  @classmethod
+  def startup_latency(cls) -> Optional[float]:
+    """Seconds from `serve` until the dev-server was ready, or None if not ready (yet)"""
+    return cls._startup_latency
+
+  @classmethod
+  async def wait_until_ready(cls, ready: Event, started: float, timeout: float) -> float:
+    logger: Logger = getLogger(cls._logger_name)
+    waiters: Set[Future] = {ensure_future(ready.wait())}
+    exited: Optional[Future] = None
+    if cls._process is not None:
+      exited = ensure_future(cls._process.wait())
+      waiters.add(exited)
+    else:  # attached to another worker's server; its port is the only signal visible from here
+      waiters.add(ensure_future(poll_port(DEV_SERVER_HOST, DEV_SERVER_PORT)))
+    try:
+      done, _ = await wait(waiters, timeout=timeout, return_when=FIRST_COMPLETED)
+    finally:
+      for waiter in waiters:
+        waiter.cancel()
+    if not done:
+      logger.warning(f"⚡Rizzler dev-server not ready after { timeout } seconds")
+      raise TimeoutError(f"Vite dev-server did not become ready within { timeout } seconds.")
+    if exited is not None and done == {exited}:
+      raise RuntimeError(f"Vite dev-server exited with code { exited.result() } before ready.")
+    cls._startup_latency = perf_counter() - started
+    logger.info(f"⚡Rizzler dev-server ready in {cls._startup_latency * 1000:.0f} ms")
+    return cls._startup_latency
+
   @classmethod
   def shutdown(cls) -> None:
+    """
+    Detaches current worker and stops the Vite dev-server once the last attached worker exits.
+
+    ---
+    """
     logger: Logger = getLogger(cls._logger_name)
-    if cls._process:
-      try:
-        logger.info("⚡Gracefully shutting down Rizzler")
-        cls._process.terminate()
-      except ProcessLookupError:
-        ...
+    server_pid: Optional[int] = None
+    if cls._lock is not None:
+      server_pid = cls._lock.server_pid()
+      if not cls._lock.detach():
+        logger.info("⚡Leaving Rizzler dev-server running for remaining workers")
+        if cls._supervisor is not None:
+          cls._supervisor.detach()
+        return
+      cls._lock.record_server(None)
+    logger.info("⚡Gracefully shutting down Rizzler")
+    if cls._supervisor is not None:
+      if cls._supervisor.stop():
+        logger.warning("⚡Rizzler dev-server ignored SIGTERM and has been killed")
+    elif server_pid is not None:
+      terminate_group(server_pid)
+
+  @classmethod
+  def stats(cls) -> Optional[ResourceStats]:
+    """CPU and RSS of the dev-server process tree owned by this worker, if any"""
+    return cls._supervisor.stats() if cls._supervisor is not None else None
 
 
 __all__ = ("Rizzler",)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/early_hints.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-27 21:14
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing `EarlyHintsMiddleware` replaying learned `Link` headers as 103 responses"""
+
+### Standard packages ###
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+### Third-party packages ###
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+EARLY_HINT_EXTENSION: str = "http.response.early_hint"
+
+
+class EarlyHintsMiddleware(object):
+  """
+  Remembers the `Link` preload header of the latest successful GET response per path and, on
+  servers advertising the `http.response.early_hint` ASGI extension, sends it ahead of the
+  application as a 103 Early Hints response so asset fetches overlap server think time.
+  Requests on servers without the extension pass straight through.
+  """
+
+  def __init__(self, app: ASGIApp, capacity: int = 1024) -> None:
+    self.app: ASGIApp = app
+    self.capacity: int = capacity
+    self.links: "OrderedDict[str, Tuple[bytes, ...]]" = OrderedDict()
+
+  def learn(self, path: str, message: Message) -> None:
+    if message["status"] != 200:
+      return
+    links: List[bytes] = [
+      link.strip()
+      for name, value in message.get("headers", [])
+      if name.lower() == b"link"
+      for link in value.split(b",")
+      if b"preload" in link
+    ]
+    if not links:
+      self.links.pop(path, None)
+      return
+    self.links[path] = tuple(links)
+    self.links.move_to_end(path)
+    while len(self.links) > self.capacity:
+      self.links.popitem(last=False)
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    if (
+      scope["type"] != "http"
+      or scope["method"] != "GET"
+      or EARLY_HINT_EXTENSION not in scope.get("extensions", {})
+    ):
+      await self.app(scope, receive, send)
+      return
+    path: str = scope["path"]
+    links: Optional[Tuple[bytes, ...]] = self.links.get(path)
+    if links is not None:
+      await send({"type": EARLY_HINT_EXTENSION, "links": list(links)})
+
+    async def learning_send(message: Message) -> None:
+      if message["type"] == "http.response.start":
+        self.learn(path, message)
+      await send(message)
+
+    await self.app(scope, receive, learning_send)
+
+
+__all__ = ("EarlyHintsMiddleware",)
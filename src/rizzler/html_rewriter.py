@@ -0,0 +1,342 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/html_rewriter.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-23 13:08
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing the build-time rewriter from dev-server templates to production entries"""
+
+### Standard packages ###
+from base64 import b64encode
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from hashlib import sha384
+from os import cpu_count, makedirs, path, walk
+from re import DOTALL, Match, Pattern, compile
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+### Third-party packages ###
+from tree_sitter import Language, Node, Parser
+from tree_sitter_html import language
+
+### Local modules ###
+from rizzler.vite_manifest import ManifestEntry, ViteManifest
+
+INLINE_CSS_LIMIT: int = 4096
+PRESERVED_ELEMENTS: Tuple[bytes, ...] = (b"pre", b"textarea")
+TEMPLATE_EXTENSIONS: Tuple[str, ...] = (".htm", ".html", ".j2", ".jinja", ".jinja2")
+TEMPLATE_SYNTAX_OR_WHITESPACE: Pattern = compile(rb"(\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\})|\s+", DOTALL)
+VITE_HELPER: Pattern = compile(
+  rb"\{\{\s*(?:vite_hmr_client\(\s*\)|vite_asset\(\s*(['\"])(?P<path>.+?)\1\s*\))\s*\}\}"
+)
+
+
+class EntryAssets(NamedTuple):
+  """Tags injected for one `vite_asset` entry, before `</head>` and before `</body>`"""
+
+  head: Tuple[str, ...] = ()
+  body: Tuple[str, ...] = ()
+
+
+Resolver = Callable[[str], EntryAssets]
+
+
+class ManifestResolver(object):
+  """
+  Resolves each entry through Vite's `manifest.json` to its own script, stylesheets and
+  `modulepreload` links for the shared chunks it imports. The index is read once on construction
+  so that instances pickle cheaply into `rewrite_templates` workers.
+
+  Stylesheets no larger than `inline_css_limit` bytes are inlined as `<style>` elements and, with
+  `integrity` set, linked files carry Subresource Integrity hashes of their emitted content.
+
+  ---
+  """
+
+  def __init__(
+    self,
+    manifest_path: str = "dist/.vite/manifest.json",
+    base: str = "./",
+    inline_css_limit: int = 0,
+    integrity: bool = False,
+  ) -> None:
+    self.base: str = base.rstrip("/")
+    self.directory: str = path.dirname(path.dirname(manifest_path))  # `<outDir>/.vite/`
+    self.entries: Dict[str, ManifestEntry] = ViteManifest(manifest_path).entries
+    self.inline_css_limit: int = inline_css_limit
+    self.integrity: bool = integrity
+    self.manifest_path: str = manifest_path
+    self._hashes: Dict[str, str] = {}
+
+  def __call__(self, path: str) -> EntryAssets:
+    try:
+      entry: ManifestEntry = self.entries[path]
+    except KeyError:
+      raise ValueError(f'"{ path }" is not an entry in Vite manifest "{ self.manifest_path }".')
+    head: List[str] = [self.stylesheet(css) for css in entry.css]
+    head.extend(
+      '<link href="%s/%s"%s rel="modulepreload">' % (self.base, chunk, self.integrity_of(chunk))
+      for chunk in entry.imports
+    )
+    return EntryAssets(
+      head=tuple(head),
+      body=(
+        '<script%s src="%s/%s" type="module"></script>'
+        % (self.integrity_of(entry.file), self.base, entry.file),
+      ),
+    )
+
+  def integrity_of(self, file: str) -> str:
+    """` integrity="sha384-…"` attribute for an emitted file, or empty if integrity is off"""
+    if not self.integrity:
+      return ""
+    if file not in self._hashes:
+      self._hashes[file] = subresource_integrity(self.read(file))
+    return ' integrity="%s"' % self._hashes[file]
+
+  def read(self, file: str) -> bytes:
+    with open(path.join(self.directory, file), "rb") as stream:
+      return stream.read()
+
+  def stylesheet(self, css: str) -> str:
+    size: int = path.getsize(path.join(self.directory, css))
+    if size <= self.inline_css_limit:
+      return "<style>%s</style>" % self.read(css).decode("utf-8").replace("</style", "<\\/style")
+    return '<link href="%s/%s"%s rel="stylesheet">' % (self.base, css, self.integrity_of(css))
+
+
+def discover_entries(source: str = "templates") -> List[str]:
+  """Entry paths referenced by `vite_asset(...)` calls across every template under `source`"""
+  entries: Set[str] = set()
+  for template in list_templates(source):
+    with open(template, "rb") as file:
+      content: bytes = file.read()
+    entries.update(
+      match.group("path").decode("utf-8")
+      for match in VITE_HELPER.finditer(content)
+      if match.group("path")
+    )
+  return sorted(entries)
+
+
+@lru_cache(maxsize=1)
+def html_parser() -> Parser:
+  return Parser(Language(language()))
+
+
+def list_templates(source: str) -> List[str]:
+  templates: List[str] = []
+  for root, directories, filenames in walk(source):
+    directories.sort()
+    for filename in sorted(filenames):
+      if path.splitext(filename)[1].lower() in TEMPLATE_EXTENSIONS:
+        templates.append(path.join(root, filename))
+  return templates
+
+
+def line_indent(content: bytes, position: int) -> Tuple[int, bytes]:
+  """Start of whitespace preceding `position` on its line and that whitespace, if line-leading"""
+  start: int = position
+  while start > 0 and content[start - 1 : start] in (b" ", b"\t"):
+    start -= 1
+  if start == 0 or content[start - 1 : start] == b"\n":
+    return start, content[start:position]
+  return position, b""
+
+
+def landmarks(content: bytes, root: Node) -> Dict[bytes, int]:
+  """Offsets of the `</head>` and `</body>` end tags, descending only through `<html>` elements"""
+  closing: Dict[bytes, int] = {}
+  pending: List[Node] = [root]
+  while pending:
+    for child in pending.pop().named_children:
+      start_tag: Optional[Node] = child.named_children[0] if child.type == "element" else None
+      if start_tag is None or start_tag.type != "start_tag" or not start_tag.named_children:
+        continue
+      name_node: Node = start_tag.named_children[0]
+      name: bytes = content[name_node.start_byte : name_node.end_byte].lower()
+      if name == b"html":
+        pending.append(child)
+      elif name in (b"head", b"body") and child.named_children[-1].type == "end_tag":
+        closing[name] = child.named_children[-1].start_byte
+  return closing
+
+
+def collapse(segment: bytes) -> bytes:
+  """Collapses whitespace runs to one space or newline, leaving template syntax untouched"""
+  return TEMPLATE_SYNTAX_OR_WHITESPACE.sub(
+    lambda match: match.group(1) or (b"\n" if b"\n" in match.group(0) else b" "), segment
+  )
+
+
+def minify_html(content: bytes) -> bytes:
+  """
+  Conservative minifier: drops comments other than conditional comments and collapses whitespace
+  in text between tags, leaving tags, `<script>`, `<style>`, `<pre>` and `<textarea>` content and
+  Jinja expressions, statements and comments byte-for-byte intact.
+
+  ---
+  """
+  root: Node = html_parser().parse(content).root_node
+  cursor: int = 0
+  gap: List[bytes] = []
+  output: List[bytes] = []
+  pending: List[Node] = list(reversed(root.children))
+  while pending:
+    node: Node = pending.pop()
+    if node.type == "element":
+      start_tag: Node = node.children[0]
+      name: bytes = b""
+      if start_tag.named_children:
+        name_node: Node = start_tag.named_children[0]
+        name = content[name_node.start_byte : name_node.end_byte].lower()
+      if name not in PRESERVED_ELEMENTS:
+        pending.extend(reversed(node.children))
+        continue
+    elif node.type == "text":
+      continue
+    gap.append(content[cursor : node.start_byte])
+    cursor = node.end_byte
+    if node.type == "comment" and not content.startswith(b"<!--[if", node.start_byte):
+      continue  # dropped; whitespace on either side collapses as one run
+    output.append(collapse(b"".join(gap)))
+    output.append(content[node.start_byte : node.end_byte])
+    gap.clear()
+  gap.append(content[cursor:])
+  output.append(collapse(b"".join(gap)))
+  return b"".join(output)
+
+
+def subresource_integrity(content: bytes) -> str:
+  return "sha384-" + b64encode(sha384(content).digest()).decode("ascii")
+
+
+def rewrite(content: bytes, resolve: Resolver) -> bytes:
+  """
+  Rewrites one template from a single tree-sitter parse: `vite_hmr_client()` calls are dropped and
+  each `vite_asset(...)` call is replaced by its resolved tags, hoisted before `</head>` and
+  `</body>` where the document has them and left in place otherwise.
+
+  ---
+  """
+  tree = html_parser().parse(content)
+  closing: Dict[bytes, int] = landmarks(content, tree.root_node)
+  calls: List[Tuple[int, int, Optional[bytes], Optional[str]]] = []
+  match: Match
+  for match in VITE_HELPER.finditer(content):
+    node: Optional[Node] = tree.root_node.descendant_for_byte_range(match.start(), match.end())
+    if node is None or node.type != "text":
+      continue  # inside an attribute, comment, `<script>` or `<style>`; leave untouched
+    helper: Optional[bytes] = match.group("path")
+    start, indent = line_indent(content, match.start())
+    end: int = match.end()
+    while content[end : end + 1] in (b" ", b"\t"):
+      end += 1
+    line: Optional[bytes] = None
+    if (start == 0 or content[start - 1 : start] == b"\n") and content[end : end + 1] in (
+      b"\n",
+      b"",
+    ):
+      line, end = indent, end + 1
+    else:
+      start, end = match.start(), match.end()
+    calls.append((start, end, line, helper.decode("utf-8") if helper else None))
+  edits: List[Tuple[int, int, bytes]] = []
+  hoisted: Dict[bytes, List[str]] = {b"head": [], b"body": []}
+  for start, end, line, entry in calls:
+    inline: List[str] = []
+    if entry is not None:
+      assets: EntryAssets = resolve(entry)
+      for section, tags in ((b"head", assets.head), (b"body", assets.body)):
+        for tag in tags:
+          if section not in closing:
+            inline.append(tag)
+          elif tag not in hoisted[section]:
+            hoisted[section].append(tag)
+    if line is not None:
+      edits.append((start, end, b"".join(line + tag.encode("utf-8") + b"\n" for tag in inline)))
+    else:
+      edits.append((start, end, "".join(inline).encode("utf-8")))
+  for section, pending in hoisted.items():
+    if pending:
+      start, indent = line_indent(content, closing[section])
+      nested: bytes = indent + b"  " if start != closing[section] else b""
+      edits.append(
+        (start, start, b"".join(nested + tag.encode("utf-8") + b"\n" for tag in pending))
+      )
+  output: List[bytes] = []
+  cursor: int = 0
+  for start, end, replacement in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+    output.append(content[cursor:start])
+    output.append(replacement)
+    cursor = end
+  output.append(content[cursor:])
+  return b"".join(output)
+
+
+def rewrite_file(
+  source: str, destination: str, resolve: Resolver, minify: bool = False
+) -> Tuple[str, bool]:
+  with open(source, "rb") as file:
+    content: bytes = file.read()
+  rewritten: bytes = rewrite(content, resolve)
+  if minify:
+    rewritten = minify_html(rewritten)
+  makedirs(path.dirname(destination) or ".", exist_ok=True)
+  with open(destination, "wb") as file:
+    file.write(rewritten)
+  return destination, rewritten != content
+
+
+def rewrite_templates(
+  source: str = "templates",
+  destination: str = "dist",
+  resolve: Optional[Resolver] = None,
+  minify: bool = False,
+  max_workers: Optional[int] = None,
+  parallel_threshold: int = 32,
+) -> List[Tuple[str, bool]]:
+  """
+  Rewrites every template under `source` into the same relative path under `destination`,
+  spreading the work across a process pool once there are at least `parallel_threshold` files.
+  Entries resolve through `ManifestResolver` over `dist/.vite/manifest.json` unless `resolve` is
+  given, which must then be picklable (a module-level function or instance) to run in the pool.
+
+  ---
+  """
+  if resolve is None:
+    resolve = ManifestResolver()
+  jobs: List[Tuple[str, str]] = [
+    (template, path.join(destination, path.relpath(template, source)))
+    for template in list_templates(source)
+  ]
+  if len(jobs) < parallel_threshold or (max_workers or cpu_count() or 1) < 2:
+    return [rewrite_file(template, target, resolve, minify) for template, target in jobs]
+  with ProcessPoolExecutor(max_workers=max_workers) as executor:
+    return list(
+      executor.map(
+        rewrite_file,
+        [template for template, _ in jobs],
+        [target for _, target in jobs],
+        [resolve] * len(jobs),
+        [minify] * len(jobs),
+        chunksize=max(1, len(jobs) // ((max_workers or cpu_count() or 1) * 4)),
+      )
+    )
+
+
+__all__ = (
+  "INLINE_CSS_LIMIT",
+  "EntryAssets",
+  "ManifestResolver",
+  "discover_entries",
+  "minify_html",
+  "rewrite",
+  "rewrite_file",
+  "rewrite_templates",
+)
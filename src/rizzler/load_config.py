@@ -22,6 +22,9 @@ class LoadConfig(BaseModel):
   command: Optional[StrictStr] = None
   framework: Optional[StrictStr] = None
   logger_name: Optional[StrictStr] = None
+  manifest_path: Optional[StrictStr] = None
+  mode: Optional[StrictStr] = None
+  static_url: Optional[StrictStr] = None
 
   @field_validator("command")
   def validate_command(cls, value: str) -> str:
@@ -45,5 +48,11 @@ class LoadConfig(BaseModel):
       raise ValueError('The "logger_name" value must be one of "gunicorn", "rzl", or "uvicorn".')
     return value
 
+  @field_validator("mode")
+  def validate_mode(cls, value: str) -> str:
+    if value.lower() not in {"development", "production"}:
+      raise ValueError('The "mode" value must be one of "development" or "production".')
+    return value.lower()
+
 
 __all__ = ("LoadConfig",)
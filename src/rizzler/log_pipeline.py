@@ -0,0 +1,170 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/log_pipeline.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-19 20:11
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing `LogPipeline` relaying subprocess output into Python logging"""
+
+### Standard packages ###
+from asyncio import Event, sleep
+from asyncio.streams import StreamReader
+from codecs import IncrementalDecoder, getincrementaldecoder
+from collections import deque
+from logging import ERROR, INFO, WARNING, Logger
+from re import Pattern, compile
+from time import monotonic, time
+from typing import Deque, List, NamedTuple, Optional, Tuple
+
+ANSI_ESCAPE: Pattern = compile(r"\x1b\[[0-9;?]*[ -/]*[@-~]|\x1b\][^\x07]*\x07")
+ERROR_MARKERS: Pattern = compile(r"(?i)\berror\b|✘|\bfailed\b")
+WARNING_MARKERS: Pattern = compile(r"(?i)\bwarn(?:ing)?\b|⚠")
+
+
+class LogLine(NamedTuple):
+  created: float
+  level: int
+  message: str
+
+
+class LogPipeline(object):
+  """
+  Reads subprocess streams in chunks, strips ANSI escape sequences, assigns each line a level from
+  its content, coalesces consecutive repeats, rate-limits bursts and keeps the most recent lines
+  in a bounded ring buffer queryable with `tail`. Stderr is relayed at INFO like stdout unless a
+  line reads as an error or warning, since Vite writes ordinary progress to stderr.
+  """
+
+  def __init__(
+    self,
+    logger: Logger,
+    capacity: int = 1000,
+    chunk_size: int = 65536,
+    rate_limit: int = 200,
+    ready_marker: str = "ready in",
+  ) -> None:
+    self.chunk_size: int = chunk_size
+    self.logger: Logger = logger
+    self.rate_limit: int = rate_limit
+    self.ready_marker: str = ready_marker
+    self.lines: Deque[LogLine] = deque(maxlen=capacity)
+    self._last: Optional[Tuple[int, str]] = None
+    self._last_suppressed: bool = False
+    self._repeats: int = 0
+    self._suppressed: int = 0
+    self._window: Tuple[float, int] = (0.0, 0)
+
+  @staticmethod
+  def classify(message: str, default: int) -> int:
+    if ERROR_MARKERS.search(message):
+      return ERROR
+    if WARNING_MARKERS.search(message):
+      return WARNING
+    return default
+
+  def flush(self) -> None:
+    """Emits pending repeat and suppression summaries; called at the end of every stream"""
+    self.flush_repeats()
+    self.flush_suppressed()
+
+  def flush_repeats(self) -> None:
+    if self._repeats and self._last is not None:
+      self.logger.log(self._last[0], f"(last message repeated { self._repeats } times)")
+      self._repeats = 0
+
+  def flush_suppressed(self) -> None:
+    if self._suppressed:
+      self.logger.warning(f"({ self._suppressed } lines suppressed by rate limit)")
+      self._suppressed = 0
+
+  def emit(self, level: int, message: str) -> None:
+    self.lines.append(LogLine(time(), level, message))
+    if self._last == (level, message):
+      if self._last_suppressed:
+        self._suppressed += 1
+      else:
+        self._repeats += 1
+      return
+    self.flush_repeats()
+    self._last = (level, message)
+    started, count = self._window
+    now: float = monotonic()
+    if now - started >= 1.0:
+      self.flush_suppressed()  # one summary per window that hit the limit
+      started, count = now, 0
+    self._window = (started, count + 1)
+    self._last_suppressed = count >= self.rate_limit and level < ERROR
+    if self._last_suppressed:
+      self._suppressed += 1
+      return
+    self.logger.log(level, message)
+
+  async def consume(
+    self, stream: Optional[StreamReader], default: int = INFO, ready: Optional[Event] = None
+  ) -> None:
+    """Relays `stream` until EOF; sets `ready` whenever a line contains `ready_marker`"""
+    if stream is None:
+      return
+    decoder: IncrementalDecoder = getincrementaldecoder("utf-8")(errors="replace")
+    remainder: str = ""
+    while chunk := await stream.read(self.chunk_size):
+      text: str = remainder + decoder.decode(chunk)
+      *complete, remainder = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+      for raw in complete:
+        self.relay(raw, default, ready)
+    self.relay(remainder + decoder.decode(b"", final=True), default, ready)
+    self.flush()
+
+  async def follow(
+    self,
+    file_path: str,
+    finished: Event,
+    default: int = INFO,
+    ready: Optional[Event] = None,
+    interval: float = 0.1,
+  ) -> None:
+    """Relays lines appended to `file_path` like `tail -f` until `finished` is set and drained"""
+    decoder: IncrementalDecoder = getincrementaldecoder("utf-8")(errors="replace")
+    remainder: str = ""
+    with open(file_path, "rb") as file:
+      while True:
+        chunk: bytes = file.read(self.chunk_size)
+        if not chunk:
+          if finished.is_set():
+            break
+          await sleep(interval)
+          continue
+        text: str = remainder + decoder.decode(chunk)
+        *complete, remainder = text.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        for raw in complete:
+          self.relay(raw, default, ready)
+    self.relay(remainder + decoder.decode(b"", final=True), default, ready)
+    self.flush()
+
+  def reset(self) -> None:
+    """Emits pending summaries and forgets repeat and rate-limit state, e.g. for a new child"""
+    self.flush()
+    self._last = None
+    self._last_suppressed = False
+    self._window = (0.0, 0)
+
+  def relay(self, raw: str, default: int, ready: Optional[Event]) -> None:
+    message: str = ANSI_ESCAPE.sub("", raw).strip()
+    if not message:
+      return
+    if ready is not None and not ready.is_set() and self.ready_marker in message:
+      ready.set()
+    self.emit(self.classify(message, default), message)
+
+  def tail(self, limit: Optional[int] = None, level: int = 0) -> List[LogLine]:
+    """Most recent buffered lines at or above `level`, oldest first"""
+    lines: List[LogLine] = [line for line in self.lines if line.level >= level]
+    return lines if limit is None else lines[-limit:]
+
+
+__all__ = ("LogLine", "LogPipeline")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/metrics.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-29 14:26
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing `Metrics` registry and `MetricsEndpoint` serving Prometheus text format"""
+
+### Standard packages ###
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter
+from typing import Callable, Dict, Iterator, List, Tuple
+
+### Third-party packages ###
+from starlette.types import Receive, Scope, Send
+
+Labels = Tuple[Tuple[str, str], ...]
+Subscriber = Callable[[str, str, float, Dict[str, str]], None]
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+  0.0005,
+  0.001,
+  0.0025,
+  0.005,
+  0.01,
+  0.025,
+  0.05,
+  0.1,
+  0.25,
+  0.5,
+  1.0,
+  2.5,
+  5.0,
+  10.0,
+  30.0,
+  60.0,
+)
+
+
+def escape(value: str) -> str:
+  return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels: Labels, extra: str = "") -> str:
+  pairs: List[str] = [f'{ name }="{ escape(value) }"' for name, value in labels]
+  if extra:
+    pairs.append(extra)
+  return "{%s}" % ",".join(pairs) if pairs else ""
+
+
+class Metrics(object):
+  """
+  Process-wide registry of counters, gauges and histograms.
+
+  Disabled by default; instrumented code checks `Metrics._enabled` before taking any timing, so a
+  disabled registry costs one attribute lookup per instrumentation point. Collectors run only at
+  scrape time and subscribers receive every sample as it is recorded.
+
+  ---
+  """
+
+  _buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+  _collectors: List[Callable[[], None]] = []
+  _enabled: bool = False
+  _histograms: Dict[str, Dict[Labels, List[float]]] = {}
+  _lock: Lock = Lock()
+  _subscribers: List[Subscriber] = []
+  _values: Dict[str, Dict[Labels, float]] = {}
+  _types: Dict[str, str] = {}
+
+  @classmethod
+  def collector(cls, callback: Callable[[], None]) -> Callable[[], None]:
+    """Registers a callback setting gauges right before each `render`"""
+    if callback not in cls._collectors:
+      cls._collectors.append(callback)
+    return callback
+
+  @classmethod
+  def enable(cls, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+    """Starts recording and registers the dev-server gauges of `Rizzler.collect_metrics`"""
+    ### Local modules ###
+    from rizzler.core import Rizzler
+
+    cls._buckets = tuple(sorted(buckets))
+    cls._enabled = True
+    cls.collector(Rizzler.collect_metrics)
+
+  @classmethod
+  def enabled(cls) -> bool:
+    return cls._enabled
+
+  @classmethod
+  def increment(cls, name: str, value: float = 1.0, **labels: str) -> None:
+    cls.record("counter", name, value, labels)
+
+  @classmethod
+  def observe(cls, name: str, value: float, **labels: str) -> None:
+    cls.record("histogram", name, value, labels)
+
+  @classmethod
+  def record(cls, kind: str, name: str, value: float, labels: Dict[str, str]) -> None:
+    if not cls._enabled:
+      return
+    key: Labels = tuple(sorted(labels.items()))
+    with cls._lock:
+      cls._types.setdefault(name, kind)
+      if kind == "histogram":
+        series: List[float] = cls._histograms.setdefault(name, {}).setdefault(
+          key, [0.0] * (len(cls._buckets) + 2)
+        )
+        series[bisect_left(cls._buckets, value)] += 1  # slot len(buckets) is +Inf
+        series[-1] += value
+      elif kind == "counter":
+        values: Dict[Labels, float] = cls._values.setdefault(name, {})
+        values[key] = values.get(key, 0.0) + value
+      else:
+        cls._values.setdefault(name, {})[key] = value
+    for subscriber in cls._subscribers:
+      subscriber(kind, name, value, labels)
+
+  @classmethod
+  def render(cls) -> str:
+    """Every series in Prometheus text exposition format 0.0.4"""
+    for collect in cls._collectors:
+      collect()
+    lines: List[str] = []
+    with cls._lock:
+      for name in sorted(cls._types):
+        lines.append(f"# TYPE { name } { cls._types[name] }")
+        if cls._types[name] != "histogram":
+          for labels, value in sorted(cls._values.get(name, {}).items()):
+            lines.append(f"{ name }{ format_labels(labels) } { value!r}")
+          continue
+        for labels, series in sorted(cls._histograms.get(name, {}).items()):
+          cumulative: float = 0.0
+          for bound, count in zip((*cls._buckets, float("inf")), series):
+            cumulative += count
+            le: str = 'le="%s"' % ("+Inf" if bound == float("inf") else repr(bound))
+            lines.append(f"{ name }_bucket{ format_labels(labels, le) } { cumulative!r}")
+          lines.append(f"{ name }_sum{ format_labels(labels) } { series[-1]!r}")
+          lines.append(f"{ name }_count{ format_labels(labels) } { cumulative!r}")
+    return "\n".join(lines) + "\n"
+
+  @classmethod
+  def reset(cls) -> None:
+    with cls._lock:
+      cls._histograms.clear()
+      cls._types.clear()
+      cls._values.clear()
+
+  @classmethod
+  def set(cls, name: str, value: float, **labels: str) -> None:
+    cls.record("gauge", name, value, labels)
+
+  @classmethod
+  @contextmanager
+  def timer(cls, name: str, **labels: str) -> Iterator[None]:
+    """Observes the duration of the `with` block into histogram `name`, if enabled"""
+    if not cls._enabled:
+      yield
+      return
+    started: float = perf_counter()
+    try:
+      yield
+    finally:
+      cls.observe(name, perf_counter() - started, **labels)
+
+  @classmethod
+  def subscribe(cls, subscriber: Subscriber) -> Subscriber:
+    """Registers a callback receiving `(kind, name, value, labels)` for every recorded sample"""
+    cls._subscribers.append(subscriber)
+    return subscriber
+
+
+class MetricsEndpoint(object):
+  """ASGI application serving `Metrics.render()`; enables the registry when constructed"""
+
+  def __init__(self) -> None:
+    if not Metrics.enabled():
+      Metrics.enable()
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    assert scope["type"] == "http"
+    body: bytes = Metrics.render().encode("utf-8")
+    await send(
+      {
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+          (b"content-type", b"text/plain; version=0.0.4; charset=utf-8"),
+          (b"content-length", str(len(body)).encode("latin-1")),
+        ],
+      }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+__all__ = ("DEFAULT_BUCKETS", "Metrics", "MetricsEndpoint")
@@ -22,9 +22,13 @@ from rizzler.load_config import LoadConfig
 
 
 class RizzlerConfig(object):
-  _command: str = "pnpm"
+  _callbacks: List[Callable[[], None]] = []
+  _command: str = ""  # detected from lockfiles by `Rizzler.runner` unless configured
   _framework: str = "vue"
   _logger_name: str = "uvicorn"
+  _manifest_path: str = "dist/.vite/manifest.json"
+  _mode: str = "development"
+  _static_url: str = "/"
 
   @classmethod
   def load_config(cls, settings: Callable[..., List[Tuple]]) -> None:
@@ -39,10 +43,21 @@ class RizzlerConfig(object):
       cls._command = config.command or cls._command
       cls._framework = config.framework or cls._framework
       cls._logger_name = config.logger_name or cls._logger_name
+      cls._manifest_path = config.manifest_path or cls._manifest_path
+      cls._mode = config.mode or cls._mode
+      cls._static_url = config.static_url or cls._static_url
     except ValidationError:
       raise
     except Exception:
       raise TypeError('RizzlerConfig must be pydantic "BaseSettings" or list of tuples')
+    for callback in cls._callbacks:
+      callback()
+
+  @classmethod
+  def on_config_change(cls, callback: Callable[[], None]) -> Callable[[], None]:
+    """Registers a callback invoked after every successful `load_config`, e.g. cache invalidation"""
+    cls._callbacks.append(callback)
+    return callback
 
 
 __all__ = ("RizzlerConfig",)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/runtime.py
+# VERSION:     0.1.9
+# CREATED:     2024-07-03 13:36
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing package runner detection and exec-style argv for JavaScript runtimes"""
+
+### Standard packages ###
+from functools import lru_cache
+from json import load
+from os import X_OK, access, path
+from re import Pattern, compile
+from shlex import split
+from shutil import which
+from typing import Dict, Optional, Tuple
+
+DEFAULT_RUNNER: str = "pnpm"
+LOCKFILE_RUNNERS: Tuple[Tuple[str, str], ...] = (
+  ("bun.lockb", "bun"),
+  ("bun.lock", "bun"),
+  ("deno.lock", "deno"),
+  ("pnpm-lock.yaml", "pnpm"),
+  ("yarn.lock", "yarn"),
+  ("package-lock.json", "npm"),
+)
+SHELL_SYNTAX: Pattern = compile(r"[;&|<>$`()*?~\\\"'\n]")
+
+
+def detect_runner(directory: str = ".", default: str = DEFAULT_RUNNER) -> str:
+  """Package runner owning the first lockfile found in `directory`, else `default`"""
+  for lockfile, runner in LOCKFILE_RUNNERS:
+    if path.isfile(path.join(directory, lockfile)):
+      return runner
+  return default
+
+
+@lru_cache(maxsize=None)
+def executable(name: str) -> str:
+  """Absolute path of `name` on `PATH`, resolved once per process"""
+  resolved: Optional[str] = which(name)
+  if resolved is None:
+    raise FileNotFoundError(f"Cannot find '{ name }' executable on PATH.")
+  return resolved
+
+
+def local_binary(script: str, directory: str = ".") -> Optional[Tuple[str, ...]]:
+  """
+  Argv running `package.json` script `script` straight from `node_modules/.bin`, skipping the
+  package runner and its shell, when the script is a single plain command such as `vite build`
+  and has no `pre<script>` or `post<script>` lifecycle scripts that the runner would run.
+
+  ---
+  """
+  try:
+    with open(path.join(directory, "package.json"), "rb") as file:
+      scripts: Dict[str, str] = load(file).get("scripts", {})
+  except (OSError, ValueError, AttributeError):
+    return None
+  command: Optional[str] = scripts.get(script)
+  if not command or SHELL_SYNTAX.search(command):
+    return None
+  if f"pre{ script }" in scripts or f"post{ script }" in scripts:
+    return None
+  program, *arguments = split(command)
+  binary: str = path.abspath(path.join(directory, "node_modules", ".bin", program))
+  if not path.isfile(binary) or not access(binary, X_OK):
+    return None
+  return (binary, *arguments)
+
+
+def create_argv(runner: str, *arguments: str) -> Tuple[str, ...]:
+  """Argv for `<runner> create ...`; npm needs `--` before flags meant for the initializer"""
+  flags: int = next((index for index, argument in enumerate(arguments) if argument[:1] == "-"), -1)
+  if runner == "npm" and flags >= 0:
+    arguments = (*arguments[:flags], "--", *arguments[flags:])
+  return (executable(runner), "create", *arguments)
+
+
+def install_argv(runner: str) -> Tuple[str, ...]:
+  """Argv for `<runner> install`, which every supported runner spells the same"""
+  return (executable(runner), "install")
+
+
+def script_argv(
+  runner: str, script: str, *arguments: str, direct: bool = True, directory: str = "."
+) -> Tuple[str, ...]:
+  """
+  Argv running `package.json` script `script` with extra `arguments` through `runner`; with
+  `direct`, tries `local_binary` first.
+
+  ---
+  """
+  binary: Optional[Tuple[str, ...]] = local_binary(script, directory) if direct else None
+  if binary is not None:
+    return (*binary, *arguments)
+  if runner == "yarn":
+    return (executable(runner), script, *arguments)
+  if runner == "deno":  # `deno run` executes a module; scripts and tasks go through `deno task`
+    return (executable(runner), "task", script, *arguments)
+  if runner == "npm" and arguments:
+    return (executable(runner), "run", script, "--", *arguments)
+  return (executable(runner), "run", script, *arguments)
+
+
+__all__ = (
+  "DEFAULT_RUNNER",
+  "LOCKFILE_RUNNERS",
+  "create_argv",
+  "detect_runner",
+  "executable",
+  "install_argv",
+  "local_binary",
+  "script_argv",
+)
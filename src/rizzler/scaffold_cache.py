@@ -0,0 +1,112 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/scaffold_cache.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-30 10:12
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing `ScaffoldCache` for restoring `rzl initiate` scaffolds without the network"""
+
+### Standard packages ###
+from json import load
+from os import environ, listdir, makedirs, path, remove, replace, utime
+from re import sub
+from shutil import copy2, copytree, move, rmtree
+from typing import Dict, List, Optional, Tuple
+
+SCAFFOLD_ENTRIES: Tuple[str, ...] = ("package.json", "pages", "public", "vite.config.js")
+
+
+def default_directory() -> str:
+  """Per-user cache shared by every project, honoring `XDG_CACHE_HOME`"""
+  cache_home: str = environ.get("XDG_CACHE_HOME") or path.join(path.expanduser("~"), ".cache")
+  return path.join(cache_home, "rizzler", "scaffolds")
+
+
+def vite_version(package_json: str) -> Optional[str]:
+  """Version of `vite` a scaffold's `package.json` depends on, without range operators"""
+  try:
+    with open(package_json, "rb") as file:
+      package: Dict[str, Dict[str, str]] = load(file)
+  except (OSError, ValueError):
+    return None
+  requirement: Optional[str] = {
+    **package.get("dependencies", {}),
+    **package.get("devDependencies", {}),
+  }.get("vite")
+  return sub(r"^[\^~=v]+", "", requirement) if requirement else None
+
+
+class ScaffoldCache(object):
+  """
+  Rizzified scaffolds (`package.json`, `vite.config.js`, `pages` and `public`) keyed by framework
+  and the Vite version they depend on, stored under `<directory>/<framework>@<version>`.
+  Restores copy rather than hard-link files since projects edit their scaffold in place.
+  """
+
+  def __init__(self, directory: Optional[str] = None) -> None:
+    self.directory: str = directory or default_directory()
+
+  def lookup(self, framework: str, version: Optional[str] = None) -> Optional[str]:
+    """Snapshot for `framework` at `version`, or its most recently used one without a version"""
+    if version is not None:
+      snapshot: str = path.join(self.directory, f"{ framework }@{ version }")
+      return snapshot if path.isdir(snapshot) else None
+    if not path.isdir(self.directory):
+      return None
+    snapshots: List[str] = [
+      path.join(self.directory, name)
+      for name in listdir(self.directory)
+      if name.startswith(f"{ framework }@") and not name.endswith(".tmp")
+    ]
+    return max(snapshots, key=path.getmtime) if snapshots else None
+
+  def restore(self, snapshot: str, destination: str = ".") -> List[Tuple[str, bool]]:
+    """Copies every scaffold entry into `destination`; returns `(entry, replaced)` pairs"""
+    restored: List[Tuple[str, bool]] = []
+    for entry in SCAFFOLD_ENTRIES:
+      source: str = path.join(snapshot, entry)
+      target: str = path.join(destination, entry)
+      replaced: bool = path.exists(target)
+      if path.isdir(target):
+        rmtree(target)
+      elif replaced:
+        remove(target)
+      if path.isdir(source):
+        copytree(source, target)
+      elif path.isfile(source):
+        copy2(source, target)
+      restored.append((entry, replaced))
+    utime(snapshot)
+    return restored
+
+  def store(self, framework: str, source: str) -> Optional[str]:
+    """
+    Moves the scaffold entries out of `source` into the cache; returns the snapshot or `None`
+    when the scaffold is incomplete or its Vite version cannot be read.
+
+    ---
+    """
+    if not all(path.exists(path.join(source, entry)) for entry in SCAFFOLD_ENTRIES):
+      return None
+    version: Optional[str] = vite_version(path.join(source, "package.json"))
+    if version is None:
+      return None
+    snapshot: str = path.join(self.directory, f"{ framework }@{ version }")
+    staging: str = f"{ snapshot }.tmp"
+    if path.exists(staging):
+      rmtree(staging)
+    makedirs(staging)
+    for entry in SCAFFOLD_ENTRIES:
+      move(path.join(source, entry), path.join(staging, entry))
+    if path.exists(snapshot):
+      rmtree(snapshot)
+    replace(staging, snapshot)
+    return snapshot
+
+
+__all__ = ("SCAFFOLD_ENTRIES", "ScaffoldCache")
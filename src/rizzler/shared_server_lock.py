@@ -0,0 +1,127 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/shared_server_lock.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-17 22:48
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing `SharedServerLock` for electing one dev-server owner across ASGI workers"""
+
+### Standard packages ###
+from contextlib import contextmanager
+from hashlib import sha256
+from os import getcwd, getpid, kill, makedirs, path, remove
+from tempfile import gettempdir
+from typing import IO, Iterator, List, Optional, Set
+
+try:
+  from fcntl import LOCK_EX, LOCK_NB, LOCK_UN, flock
+except ImportError:  # Windows; every worker leads as before
+  flock = None  # type: ignore[assignment]
+
+
+def is_alive(pid: int) -> bool:
+  try:
+    kill(pid, 0)
+  except ProcessLookupError:
+    return False
+  except PermissionError:
+    return True
+  return True
+
+
+class SharedServerLock(object):
+  """
+  File-lock based leader election for worker processes serving the same project directory.
+
+  The worker holding `leader.lock` starts the Vite dev-server, unless one left behind by a previous
+  leader is still alive, and records its pid in `server.pid`; Vite writes to `server.log` rather
+  than to the leader's pipes so it outlives the leader. Every worker registers its own pid in
+  `workers` so that whichever detaches last knows to stop Vite.
+  """
+
+  def __init__(self, directory: Optional[str] = None) -> None:
+    if directory is None:
+      project: str = sha256(getcwd().encode("utf-8")).hexdigest()[:16]
+      directory = path.join(gettempdir(), f"rizzler-{project}")
+    makedirs(directory, exist_ok=True)
+    self.directory: str = directory
+    self.is_leader: bool = False
+    self._leader_file: Optional[IO[bytes]] = None
+
+  @contextmanager
+  def registry(self) -> Iterator[Set[int]]:
+    """Locked, pruned view of registered worker pids which is written back on exit"""
+    with open(path.join(self.directory, "workers.lock"), "ab") as lock_file:
+      if flock is not None:
+        flock(lock_file.fileno(), LOCK_EX)
+      try:
+        workers_path: str = path.join(self.directory, "workers")
+        pids: Set[int] = set()
+        if path.exists(workers_path):
+          with open(workers_path, "r") as workers_file:
+            pids = {int(line) for line in workers_file.read().split() if line.isdigit()}
+        pids = {pid for pid in pids if is_alive(pid)}
+        yield pids
+        with open(workers_path, "w") as workers_file:
+          workers_file.write("\n".join(str(pid) for pid in sorted(pids)))
+      finally:
+        if flock is not None:
+          flock(lock_file.fileno(), LOCK_UN)
+
+  def attach(self) -> bool:
+    """Registers current worker and returns whether it must start the dev-server itself"""
+    with self.registry() as pids:
+      pids.add(getpid())
+      if flock is None:
+        self.is_leader = True
+        return True
+      leader_file: IO[bytes] = open(path.join(self.directory, "leader.lock"), "ab")
+      try:
+        flock(leader_file.fileno(), LOCK_EX | LOCK_NB)
+      except BlockingIOError:
+        leader_file.close()
+        return False
+      self._leader_file = leader_file
+      self.is_leader = True
+      return self.server_pid() is None
+
+  def detach(self) -> bool:
+    """Unregisters current worker and returns whether it was the last one attached"""
+    with self.registry() as pids:
+      pids.discard(getpid())
+      last: bool = len(pids) == 0
+      if self._leader_file is not None:
+        if flock is not None:
+          flock(self._leader_file.fileno(), LOCK_UN)
+        self._leader_file.close()
+        self._leader_file = None
+      self.is_leader = False
+      return last
+
+  def record_server(self, pid: Optional[int]) -> None:
+    server_path: str = path.join(self.directory, "server.pid")
+    if pid is None:
+      if path.exists(server_path):
+        remove(server_path)
+      return
+    with open(server_path, "w") as server_file:
+      server_file.write(str(pid))
+
+  def server_pid(self) -> Optional[int]:
+    """Pid of the running dev-server recorded by the current or a previous leader, if alive"""
+    server_path: str = path.join(self.directory, "server.pid")
+    if not path.exists(server_path):
+      return None
+    with open(server_path, "r") as server_file:
+      content: List[str] = server_file.read().split()
+    if not content or not content[0].isdigit() or not is_alive(int(content[0])):
+      return None
+    return int(content[0])
+
+
+__all__ = ("SharedServerLock",)
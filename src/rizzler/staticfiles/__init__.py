@@ -0,0 +1,17 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/staticfiles/__init__.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-15 14:20
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION: https://www.w3docs.com/snippets/python/what-is-init-py-for.html
+#
+# HISTORY:
+# *************************************************************
+
+### Local modules ###
+from rizzler.staticfiles.precompress import precompress, precompress_file
+from rizzler.staticfiles.rizzle_static_files import RizzleStaticFiles
+
+__all__ = ("RizzleStaticFiles", "precompress", "precompress_file")
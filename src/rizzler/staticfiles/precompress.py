@@ -0,0 +1,81 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/staticfiles/precompress.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-15 14:20
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing build-time compression of Vite output into `.br` and `.gz` siblings"""
+
+### Standard packages ###
+from gzip import compress as gzip_compress
+from os import path, remove, walk
+from typing import Callable, Dict, List, Optional
+
+### Third-party packages ###
+brotli_compress: Optional[Callable[[bytes], bytes]]
+try:
+  from brotli import compress as brotli_compress  # type: ignore[no-redef]
+except ImportError:
+  brotli_compress = None
+
+COMPRESSIBLE_EXTENSIONS: frozenset = frozenset(
+  {".css", ".html", ".js", ".json", ".map", ".mjs", ".svg", ".txt", ".wasm", ".xml"}
+)
+ENCODING_SUFFIXES: Dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+
+def compressors() -> Dict[str, Callable[[bytes], bytes]]:
+  available: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda content: gzip_compress(content, compresslevel=9, mtime=0)
+  }
+  if brotli_compress is not None:
+    available["br"] = brotli_compress
+  return available
+
+
+def precompress(directory: str, minimum_size: int = 256) -> List[str]:
+  """
+  Write `.br` and `.gz` siblings next to every compressible file under `directory`.
+  Siblings that would not be smaller than the original are removed rather than written; returns
+  list of paths written. Brotli output requires the optional `brotli` package.
+
+  ---
+  """
+  encoders: Dict[str, Callable[[bytes], bytes]] = compressors()
+  written: List[str] = []
+  for root, _, filenames in walk(directory):
+    for filename in filenames:
+      written.extend(precompress_file(path.join(root, filename), minimum_size, encoders))
+  return written
+
+
+def precompress_file(
+  source: str,
+  minimum_size: int = 256,
+  encoders: Optional[Dict[str, Callable[[bytes], bytes]]] = None,
+) -> List[str]:
+  """Write or refresh the compressed siblings of a single file, as `precompress` does"""
+  if path.splitext(source)[1] not in COMPRESSIBLE_EXTENSIONS:
+    return []
+  with open(source, "rb") as file:
+    content: bytes = file.read()
+  written: List[str] = []
+  for encoding, encoder in (encoders or compressors()).items():
+    target: str = source + ENCODING_SUFFIXES[encoding]
+    compressed: bytes = encoder(content) if len(content) >= minimum_size else content
+    if len(compressed) >= len(content):
+      if path.exists(target):
+        remove(target)
+      continue
+    with open(target, "wb") as file:
+      file.write(compressed)
+    written.append(target)
+  return written
+
+
+__all__ = ("COMPRESSIBLE_EXTENSIONS", "ENCODING_SUFFIXES", "precompress", "precompress_file")
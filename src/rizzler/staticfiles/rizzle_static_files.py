@@ -0,0 +1,175 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/staticfiles/rizzle_static_files.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-15 14:20
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing `RizzleStaticFiles` ASGI application for serving Vite build output"""
+
+### Standard packages ###
+from hashlib import sha256
+from mimetypes import guess_type
+from os import path, stat, stat_result
+from re import Pattern, compile
+from typing import Dict, Optional, Set, Tuple
+
+### Third-party packages ###
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, PlainTextResponse, Response
+from starlette.types import Receive, Scope, Send
+
+### Local modules ###
+from rizzler.staticfiles.precompress import ENCODING_SUFFIXES
+
+
+def accepted_encodings(accept_encoding: str) -> Set[str]:
+  """Codings from an `Accept-Encoding` header value, excluding those explicitly refused by q=0"""
+  accepted: Set[str] = set()
+  for item in accept_encoding.split(","):
+    coding, _, parameters = item.strip().partition(";")
+    quality: str = parameters.strip().partition("=")[2].strip() if parameters else "1"
+    try:
+      if float(quality) <= 0:
+        continue
+    except ValueError:
+      continue
+    if coding:
+      accepted.add(coding.strip().lower())
+  return accepted
+
+
+def weak_match(etag: str, if_none_match: str) -> bool:
+  """Weak comparison of `etag` against an `If-None-Match` value, as RFC 9110 requires for it"""
+  opaque: str = etag[2:] if etag.startswith("W/") else etag
+  for tag in if_none_match.split(","):
+    tag = tag.strip()
+    if tag == "*" or (tag[2:] if tag.startswith("W/") else tag) == opaque:
+      return True
+  return False
+
+
+class RizzleStaticFiles(object):
+  """
+  ASGI application serving a Vite `dist` directory with precompressed `.br`/`.gz` siblings,
+  strong content-hash ETags and `immutable` Cache-Control for content-hashed filenames under
+  `immutable_directories`, which defaults to Vite's `assets` output directory. Bodies are handed
+  to the server with `http.response.zerocopysend` when available.
+  """
+
+  def __init__(
+    self,
+    directory: str,
+    immutable_directories: Tuple[str, ...] = ("assets",),
+    immutable_pattern: str = r"[-.][A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$",
+    max_age: int = 31536000,
+  ) -> None:
+    self.directory: str = path.realpath(directory)
+    self.immutable_directories: Tuple[str, ...] = tuple(
+      path.join(self.directory, immutable) for immutable in immutable_directories
+    )
+    self.immutable_pattern: Pattern = compile(immutable_pattern)
+    self.max_age: int = max_age
+    self._etags: Dict[str, Tuple[int, int, str]] = {}
+
+  def etag(self, file_path: str, file_stat: stat_result) -> str:
+    """Strong ETag from the content digest, cached until size or mtime changes"""
+    cached: Optional[Tuple[int, int, str]] = self._etags.get(file_path)
+    if cached is not None and cached[0] == file_stat.st_mtime_ns and cached[1] == file_stat.st_size:
+      return cached[2]
+    digest = sha256()
+    with open(file_path, "rb") as file:
+      while chunk := file.read(65536):
+        digest.update(chunk)
+    etag: str = f'"{ digest.hexdigest()[:32] }"'
+    self._etags[file_path] = (file_stat.st_mtime_ns, file_stat.st_size, etag)
+    return etag
+
+  def immutable(self, full_path: str) -> bool:
+    """Whether `full_path` is content-hashed Vite output, safe to cache for `max_age` seconds"""
+    hashed: bool = bool(self.immutable_pattern.search(path.basename(full_path)))
+    return hashed and any(
+      path.commonpath((immutable, full_path)) == immutable
+      for immutable in self.immutable_directories
+    )
+
+  def lookup(self, route_path: str) -> Optional[Tuple[str, stat_result]]:
+    full_path: str = path.realpath(path.join(self.directory, route_path.lstrip("/")))
+    if path.commonpath((self.directory, full_path)) != self.directory:
+      return None
+    if path.isdir(full_path):
+      full_path = path.join(full_path, "index.html")
+    try:
+      file_stat: stat_result = stat(full_path)
+    except (FileNotFoundError, NotADirectoryError):
+      return None
+    return full_path, file_stat
+
+  def negotiate(
+    self, full_path: str, file_stat: stat_result, headers: Headers
+  ) -> Tuple[str, stat_result, Optional[str]]:
+    accepted: Set[str] = accepted_encodings(headers.get("accept-encoding", ""))
+    for encoding, suffix in ENCODING_SUFFIXES.items():
+      if encoding not in accepted:
+        continue
+      try:
+        return full_path + suffix, stat(full_path + suffix), encoding
+      except FileNotFoundError:
+        continue
+    return full_path, file_stat, None
+
+  async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+    assert scope["type"] == "http"
+    if scope["method"] not in {"GET", "HEAD"}:
+      await PlainTextResponse("Method Not Allowed", status_code=405)(scope, receive, send)
+      return
+    route_path: str = scope["path"]
+    root_path: str = scope.get("root_path", "")
+    if root_path and route_path.startswith(root_path):
+      route_path = route_path[len(root_path) :]
+    found: Optional[Tuple[str, stat_result]] = self.lookup(route_path)
+    if found is None:
+      await PlainTextResponse("Not Found", status_code=404)(scope, receive, send)
+      return
+    full_path, file_stat = found
+    request_headers: Headers = Headers(scope=scope)
+    served_path, served_stat, encoding = self.negotiate(full_path, file_stat, request_headers)
+    etag: str = self.etag(served_path, served_stat)
+    headers: Dict[str, str] = {"etag": etag, "vary": "Accept-Encoding"}
+    if self.immutable(full_path):
+      headers["cache-control"] = f"public, max-age={ self.max_age }, immutable"
+    else:
+      headers["cache-control"] = "no-cache"
+    if encoding is not None:
+      headers["content-encoding"] = encoding
+    if weak_match(etag, request_headers.get("if-none-match", "")):
+      await Response(status_code=304, headers=headers)(scope, receive, send)
+      return
+    media_type: str = guess_type(full_path)[0] or "application/octet-stream"
+    if "http.response.zerocopysend" in scope.get("extensions", {}):
+      response: Response = Response(media_type=media_type, headers=headers)
+      response.headers["content-length"] = str(served_stat.st_size)
+      await send({"type": "http.response.start", "status": 200, "headers": response.raw_headers})
+      if scope["method"] == "HEAD":
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+        return
+      with open(served_path, "rb") as file:
+        await send(
+          {
+            "type": "http.response.zerocopysend",
+            "file": file,
+            "count": served_stat.st_size,
+            "more_body": False,
+          }
+        )
+      return
+    await FileResponse(
+      served_path, headers=headers, media_type=media_type, stat_result=served_stat
+    )(scope, receive, send)
+
+
+__all__ = ("RizzleStaticFiles",)
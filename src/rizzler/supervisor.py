@@ -0,0 +1,317 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/supervisor.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-20 23:37
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing `Supervisor` for the long-running Vite dev-server child"""
+
+### Standard packages ###
+from asyncio import Event, Future, create_subprocess_exec, ensure_future, gather, sleep
+from asyncio.subprocess import PIPE, STDOUT, Process
+from logging import INFO, Logger
+from os import listdir, sysconf
+from signal import SIGTERM
+from time import monotonic
+from time import sleep as block
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+### Local modules ###
+from rizzler.log_pipeline import LogPipeline
+
+try:
+  from os import killpg
+  from signal import SIGKILL
+except ImportError:  # Windows; no process groups, signal the child alone
+  from os import kill as killpg
+  from signal import SIGTERM as SIGKILL
+
+
+class ProcessSample(NamedTuple):
+  pid: int
+  ppid: int
+  pgid: int
+  state: str
+  cpu_ticks: int
+  rss_pages: int
+
+
+class ResourceStats(NamedTuple):
+  cpu_percent: float
+  cpu_seconds: float
+  pids: Tuple[int, ...]
+  rss_bytes: int
+
+
+def read_processes() -> Dict[int, ProcessSample]:
+  """Snapshot of every process from `/proc/<pid>/stat`; empty on systems without procfs"""
+  samples: Dict[int, ProcessSample] = {}
+  try:
+    entries: List[str] = listdir("/proc")
+  except FileNotFoundError:
+    return samples
+  for entry in entries:
+    if not entry.isdigit():
+      continue
+    try:
+      with open(f"/proc/{ entry }/stat", "rb") as stat_file:
+        content: str = stat_file.read().decode("utf-8", errors="replace")
+    except OSError:
+      continue
+    fields: List[str] = content[content.rindex(")") + 2 :].split()
+    samples[int(entry)] = ProcessSample(
+      pid=int(entry),
+      ppid=int(fields[1]),
+      pgid=int(fields[2]),
+      state=fields[0],
+      cpu_ticks=int(fields[11]) + int(fields[12]),
+      rss_pages=int(fields[21]),
+    )
+  return samples
+
+
+def descendants(root: int, samples: Dict[int, ProcessSample]) -> List[ProcessSample]:
+  children: Dict[int, List[int]] = {}
+  for sample in samples.values():
+    children.setdefault(sample.ppid, []).append(sample.pid)
+  tree: List[ProcessSample] = []
+  pending: List[int] = [root]
+  while pending:
+    pid: int = pending.pop()
+    if pid in samples:
+      tree.append(samples[pid])
+    pending.extend(children.get(pid, []))
+  return tree
+
+
+def group_alive(pgid: int) -> bool:
+  samples: Dict[int, ProcessSample] = read_processes()
+  if samples:
+    return any(sample.pgid == pgid and sample.state != "Z" for sample in samples.values())
+  try:
+    killpg(pgid, 0)
+  except ProcessLookupError:
+    return False
+  return True
+
+
+def terminate_group(pgid: int, grace_period: float = 5.0, interval: float = 0.05) -> bool:
+  """
+  Sends SIGTERM to the process group and escalates to SIGKILL if any member outlives
+  `grace_period`; returns whether escalation was necessary.
+
+  ---
+  """
+  try:
+    killpg(pgid, SIGTERM)
+  except ProcessLookupError:
+    return False
+  deadline: float = monotonic() + grace_period
+  while monotonic() < deadline:
+    if not group_alive(pgid):
+      return False
+    block(min(interval, max(deadline - monotonic(), 0)))
+  try:
+    killpg(pgid, SIGKILL)
+  except ProcessLookupError:
+    return False
+  return True
+
+
+async def terminate_group_async(
+  pgid: int, grace_period: float = 5.0, interval: float = 0.05
+) -> bool:
+  """Like `terminate_group`, but waits with `asyncio.sleep` so the event loop keeps running"""
+  try:
+    killpg(pgid, SIGTERM)
+  except ProcessLookupError:
+    return False
+  deadline: float = monotonic() + grace_period
+  while monotonic() < deadline:
+    if not group_alive(pgid):
+      return False
+    await sleep(min(interval, max(deadline - monotonic(), 0)))
+  try:
+    killpg(pgid, SIGKILL)
+  except ProcessLookupError:
+    return False
+  return True
+
+
+class Supervisor(object):
+  """
+  Runs an exec-style argv in its own process group, relays its output through a `LogPipeline`,
+  restarts it with exponential backoff when it exits unexpectedly, giving up after `max_restarts`
+  crashes in a row with no stable run longer than `backoff_maximum` in between, and reports CPU
+  and RSS usage of its whole process tree. With `log_path`, the child writes to that file instead
+  of pipes owned by this process, so it keeps running when supervision is detached and this
+  process exits.
+  """
+
+  def __init__(
+    self,
+    command: Sequence[str],
+    logger: Logger,
+    pipeline: LogPipeline,
+    backoff_initial: float = 0.5,
+    backoff_maximum: float = 30.0,
+    grace_period: float = 5.0,
+    log_path: Optional[str] = None,
+    max_restarts: int = 10,
+    on_spawn: Optional[Callable[[int], None]] = None,
+  ) -> None:
+    self.backoff_initial: float = backoff_initial
+    self.backoff_maximum: float = backoff_maximum
+    self.command: Tuple[str, ...] = tuple(command)
+    self.grace_period: float = grace_period
+    self.log_path: Optional[str] = log_path
+    self.logger: Logger = logger
+    self.max_restarts: int = max_restarts
+    self.on_spawn: Optional[Callable[[int], None]] = on_spawn
+    self.pipeline: LogPipeline = pipeline
+    self.process: Optional[Process] = None
+    self.restarts: int = 0
+    self.started_at: Optional[float] = None
+    self._sample: Optional[Tuple[float, int]] = None
+    self._stopping: bool = False
+    self._watcher: Optional[Future] = None
+
+  async def spawn(self) -> Process:
+    if self.log_path is None:
+      self.process = await create_subprocess_exec(
+        *self.command, stdout=PIPE, stderr=PIPE, restore_signals=True, start_new_session=True
+      )
+    else:
+      with open(self.log_path, "wb") as log_file:  # the previous child is gone; start afresh
+        self.process = await create_subprocess_exec(
+          *self.command,
+          stdout=log_file,
+          stderr=STDOUT,
+          restore_signals=True,
+          start_new_session=True,
+        )
+    self.started_at = monotonic()
+    self._sample = None
+    if self.on_spawn is not None:
+      self.on_spawn(self.process.pid)
+    return self.process
+
+  async def start(self, ready: Optional[Event] = None) -> Process:
+    self._stopping = False
+    process: Process = await self.spawn()
+    self._watcher = ensure_future(self.watch(process, ready))
+    self._watcher.add_done_callback(self.report)
+    return process
+
+  def report(self, watcher: Future) -> None:
+    """Logs an unexpected failure of the watch task instead of letting it pass silently"""
+    if watcher.cancelled() or watcher.exception() is None:
+      return
+    self.logger.error(
+      "⚡Rizzler dev-server supervision stopped unexpectedly", exc_info=watcher.exception()
+    )
+
+  async def watch(self, process: Process, ready: Optional[Event]) -> None:
+    failures: int = 0
+    while True:
+      returncode: int = await self.relay(process, ready)
+      if self._stopping:
+        return
+      if group_alive(process.pid):
+        await terminate_group_async(process.pid, self.grace_period)
+      uptime: float = monotonic() - (self.started_at or monotonic())
+      if uptime > self.backoff_maximum:  # stayed up long enough; earlier crashes no longer count
+        failures, self.restarts = 0, 0
+      else:
+        failures += 1
+      if self.restarts >= self.max_restarts:
+        self.logger.error(f"⚡Rizzler dev-server exited with code { returncode }; giving up")
+        return
+      delay: float = min(self.backoff_initial * 2 ** (failures - 1), self.backoff_maximum)
+      self.logger.warning(
+        f"⚡Rizzler dev-server exited with code { returncode }; restarting in { delay:.1f}s"
+      )
+      while True:
+        await sleep(delay)
+        if self._stopping:
+          return
+        self.restarts += 1
+        try:
+          process = await self.spawn()
+          break
+        except OSError as error:  # e.g. the runner was removed or file descriptors ran out
+          failures += 1
+          if self.restarts >= self.max_restarts:
+            self.logger.error(f"⚡Rizzler dev-server could not be restarted: { error }; giving up")
+            return
+          delay = min(self.backoff_initial * 2 ** (failures - 1), self.backoff_maximum)
+          self.logger.warning(
+            f"⚡Rizzler dev-server could not be restarted: { error }; retrying in { delay:.1f}s"
+          )
+
+  async def relay(self, process: Process, ready: Optional[Event]) -> int:
+    """Relays the child's output until it exits, from its pipes or by following `log_path`"""
+    self.pipeline.reset()  # nothing from a previous child counts as a repeat or toward the limit
+    if self.log_path is None:
+      returncode, _, _ = await gather(
+        process.wait(),
+        self.pipeline.consume(process.stdout, INFO, ready),
+        self.pipeline.consume(process.stderr, INFO, ready),
+      )
+      return returncode
+    exited: Event = Event()
+    waiter: Future = ensure_future(process.wait())
+    waiter.add_done_callback(lambda _: exited.set())
+    await self.pipeline.follow(self.log_path, exited, INFO, ready)
+    return await waiter
+
+  def detach(self) -> None:
+    """Stops supervising without signalling the child, leaving it running for other workers"""
+    self._stopping = True
+
+  def stats(self) -> Optional[ResourceStats]:
+    """CPU and RSS totals across the child's process tree, read from `/proc`"""
+    if self.process is None or self.process.returncode is not None:
+      return None
+    tree: List[ProcessSample] = descendants(self.process.pid, read_processes())
+    if not tree:
+      return None
+    ticks: int = sum(sample.cpu_ticks for sample in tree)
+    now: float = monotonic()
+    clock_ticks: int = sysconf("SC_CLK_TCK")
+    previous: Tuple[float, int] = self._sample or (self.started_at or now, 0)
+    elapsed: float = now - previous[0]
+    self._sample = (now, ticks)
+    return ResourceStats(
+      cpu_percent=((ticks - previous[1]) / clock_ticks) / elapsed * 100 if elapsed > 0 else 0.0,
+      cpu_seconds=ticks / clock_ticks,
+      pids=tuple(sample.pid for sample in tree),
+      rss_bytes=sum(sample.rss_pages for sample in tree) * sysconf("SC_PAGE_SIZE"),
+    )
+
+  def stop(self) -> bool:
+    """Stops supervising and terminates the process group; returns whether SIGKILL was needed"""
+    self._stopping = True
+    if self.process is None:
+      return False
+    return terminate_group(self.process.pid, self.grace_period)
+
+  async def stop_async(self) -> bool:
+    """Like `stop`, but waits for the process group without blocking the event loop"""
+    self._stopping = True
+    if self.process is None:
+      return False
+    return await terminate_group_async(self.process.pid, self.grace_period)
+
+  def uptime(self) -> Optional[float]:
+    if self.started_at is None or self.process is None or self.process.returncode is not None:
+      return None
+    return monotonic() - self.started_at
+
+
+__all__ = ("ResourceStats", "Supervisor", "terminate_group", "terminate_group_async")
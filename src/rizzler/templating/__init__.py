@@ -11,6 +11,6 @@
 # *************************************************************
 
 ### Local modules ###
-from rizzler.templating.rizzle_templates import RizzleTemplates
+from rizzler.templating.rizzle_templates import BYTECODE_CACHE_DIRECTORY, RizzleTemplates
 
-__all__ = ("RizzleTemplates",)
+__all__ = ("BYTECODE_CACHE_DIRECTORY", "RizzleTemplates")
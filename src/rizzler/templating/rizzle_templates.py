@@ -11,55 +11,445 @@
 # *************************************************************
 
 ### Standard packages ###
-from typing import List
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import sha256
+from json import dumps
+from os import makedirs
+from re import Pattern, compile
+from threading import Lock
+from time import perf_counter
+from typing import Any, AsyncIterator, Dict, List, NamedTuple, Optional, Tuple
 
 ### Third-party packages ###
+from jinja2 import Environment, FileSystemBytecodeCache, Template, TemplateError, nodes
 from markupsafe import Markup
-from starlette.templating import Jinja2Templates
+from starlette.requests import Request
+from starlette.background import BackgroundTask
+from starlette.responses import HTMLResponse, Response, StreamingResponse
+from starlette.templating import Jinja2Templates, _TemplateResponse
 
 ### Local modules ###
 from rizzler import Rizzler
+from rizzler.metrics import Metrics
+from rizzler.vite_manifest import ManifestEntry, ViteManifest
+
+
+BYTECODE_CACHE_DIRECTORY: str = ".rizzler/jinja"
+HEAD_END: Pattern = compile(r"(?i)</head\s*>")
+MARKUP_CACHE_SIZE: int = 256
+ResponseKey = Tuple[str, str, int, Optional[float]]
+
+
+class CachedResponse(NamedTuple):
+  body: bytes
+  etag: str
+  template: Template
+
+
+class CachedTemplateResponse(_TemplateResponse):
+  """
+  Starlette's template response around a body rendered earlier, so cache hits still expose
+  `template` and `context` and send `http.response.debug` like a fresh render.
+
+  ---
+  """
+
+  def __init__(
+    self,
+    template: Template,
+    context: Dict[str, Any],
+    body: bytes,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+    media_type: Optional[str] = None,
+    background: Optional[BackgroundTask] = None,
+  ) -> None:
+    self.template = template
+    self.context = context
+    HTMLResponse.__init__(self, body, status_code, headers, media_type, background)
+
+
+def referenced_entries(environment: Environment, name: str) -> Tuple[Tuple[str, ...], bool]:
+  """Literal `vite_asset(...)` paths in a template's own source and whether it calls the client"""
+  assert environment.loader is not None
+  source: str = environment.loader.get_source(environment, name)[0]
+  entries: List[str] = []
+  hmr_client: bool = False
+  for call in environment.parse(source).find_all(nodes.Call):
+    if not isinstance(call.node, nodes.Name):
+      continue
+    if call.node.name == "vite_hmr_client":
+      hmr_client = True
+    elif call.node.name == "vite_asset" and call.args and isinstance(call.args[0], nodes.Const):
+      entries.append(call.args[0].value)
+  return tuple(dict.fromkeys(entries)), hmr_client
+
+
+def context_digest(context: Dict[str, Any]) -> Optional[str]:
+  """Stable digest of a cache context; None if any of its values is not JSON-serializable"""
+  try:
+    serialized: str = dumps(context, separators=(",", ":"), sort_keys=True)
+  except (TypeError, ValueError):
+    return None
+  return sha256(serialized.encode("utf-8")).hexdigest()
+
+
+async def stream_template(
+  template: Template, context: Dict[str, Any], flush_size: int
+) -> AsyncIterator[bytes]:
+  """
+  Renders `template` through `generate_async`, flushing everything up to `</head>` the moment it
+  is rendered and the rest whenever at least `flush_size` characters are pending.
+
+  ---
+  """
+  started: float = perf_counter() if Metrics._enabled else 0.0
+  pending: List[str] = []
+  size: int = 0
+  head_sent: bool = False
+  async for chunk in template.generate_async(context):
+    pending.append(chunk)
+    size += len(chunk)
+    if (not head_sent and HEAD_END.search(chunk)) or (head_sent and size >= flush_size):
+      head_sent = True
+      yield "".join(pending).encode("utf-8")
+      pending.clear()
+      size = 0
+  if pending:
+    yield "".join(pending).encode("utf-8")
+  if started:
+    Metrics.observe(
+      "rizzler_template_render_seconds", perf_counter() - started, template=template.name or ""
+    )
+
+
+@lru_cache(maxsize=MARKUP_CACHE_SIZE)
+def render_vite_asset(
+  path: str, mode: str, static_url: str, manifest_path: str, version: Optional[float]
+) -> Markup:
+  tags: List[str] = []
+  if mode == "production":
+    static_url = static_url.rstrip("/")
+    entry: ManifestEntry = RizzleTemplates._manifests[manifest_path].resolve(path)
+    for stylesheet in entry.css:
+      tags.append('<link href="%s/%s" rel="stylesheet">' % (static_url, stylesheet))
+    for chunk in entry.imports:
+      tags.append('<link href="%s/%s" rel="modulepreload">' % (static_url, chunk))
+    tags.append('<script src="%s/%s" type="module"></script>' % (static_url, entry.file))
+    return Markup("\n".join(tags))
+  tags.append(
+    """
+    <script async defer type="module" src="http://localhost:5173/%s"></script>
+    """
+    % path
+  )
+  return Markup("\n".join(tags))
+
+
+@lru_cache(maxsize=MARKUP_CACHE_SIZE)
+def render_preload_links(
+  entries: Tuple[str, ...],
+  hmr_client: bool,
+  mode: str,
+  static_url: str,
+  manifest_path: str,
+  version: Optional[float],
+) -> str:
+  """`Link` header value preloading everything the given entries load, for `vite_asset` parity"""
+  links: List[str] = []
+  if mode == "production":
+    static_url = static_url.rstrip("/")
+    for path in entries:
+      entry: ManifestEntry = RizzleTemplates._manifests[manifest_path].resolve(path)
+      links.extend("<%s/%s>; rel=preload; as=style" % (static_url, css) for css in entry.css)
+      links.extend("<%s/%s>; rel=modulepreload" % (static_url, chunk) for chunk in entry.imports)
+      links.append("<%s/%s>; rel=modulepreload" % (static_url, entry.file))
+  else:
+    if hmr_client:
+      links.append("<http://localhost:5173/@vite/client>; rel=modulepreload")
+    links.extend("<http://localhost:5173/%s>; rel=modulepreload" % path for path in entries)
+  return ", ".join(dict.fromkeys(links))
+
+
+@lru_cache(maxsize=MARKUP_CACHE_SIZE)
+def render_vite_hmr_client(framework: str, mode: str) -> Markup:
+  tags: List[str] = []
+  if mode == "production":
+    return Markup("")
+  tags.append(
+    """
+    <script type="module" src="http://localhost:5173/@vite/client"></script>
+    """
+  )
+  if framework == "react":
+    tags.append(
+      """
+      <script type="module">
+        import RefreshRuntime from 'http://localhost:5173/@react-refresh'
+        RefreshRuntime.injectIntoGlobalHook(window)
+        window.$RefreshReg$ = () => {{}}
+        window.$RefreshSig$ = () => (type) => type
+        window.__vite_plugin_react_preamble_installed__=true
+      </script>
+      """
+    )
+  return Markup("\n".join(tags))
 
 
 class RizzleTemplates(Jinja2Templates):
-  def __init__(self, directory: str) -> None:
+  """
+  `Jinja2Templates` with `vite_asset` and `vite_hmr_client` globals.
+
+  With `response_cache_size` set, `TemplateResponse` calls that pass `cache_context` keep up to
+  that many rendered bodies in an LRU keyed by template name and a digest of that context alone;
+  calls without it always render. The caller vouches that the output depends on nothing else,
+  neither `request` nor the rest of the render context. Entries are dropped when the template
+  file changes, the Vite manifest is rebuilt or Rizzler config is reloaded, and cached responses
+  carry an ETag answered with 304 on a matching `If-None-Match`.
+
+  With `link_headers` set, responses carry a `Link` header preloading the entry assets a template
+  references through `vite_asset`, which `EarlyHintsMiddleware` can replay as 103 Early Hints.
+
+  With `bytecode_cache_directory` set, compiled templates persist there across processes; `rzl
+  build` fills `.rizzler/jinja` ahead of time through `precompile`.
+
+  While `Metrics` is enabled, render latency is observed per template and response cache hits are
+  counted; otherwise no timing is taken.
+
+  ---
+  """
+
+  _generation: int = 0
+  _manifests: Dict[str, ViteManifest] = {}
+
+  def __init__(
+    self,
+    directory: str,
+    response_cache_size: int = 0,
+    bytecode_cache_directory: Optional[str] = None,
+    link_headers: bool = False,
+  ) -> None:
     super().__init__(directory=directory)
+    self.bytecode_cache_directory: Optional[str] = bytecode_cache_directory
+    if bytecode_cache_directory is not None:
+      makedirs(bytecode_cache_directory, exist_ok=True)
+      self.env.bytecode_cache = FileSystemBytecodeCache(bytecode_cache_directory)
+    self._async_env: Optional[Environment] = None
     self.env.globals["vite_hmr_client"] = self.vite_hmr_client
     self.env.globals["vite_asset"] = self.vite_asset
+    self.link_headers: bool = link_headers
+    self.response_cache_size: int = response_cache_size
+    self._entries: Dict[str, Tuple[Template, Tuple[str, ...], bool]] = {}
+    self._responses: "OrderedDict[ResponseKey, CachedResponse]" = OrderedDict()
+    self._responses_lock: Lock = Lock()
+
+  def async_env(self) -> Environment:
+    """Async-enabled overlay of `env` sharing its loader and globals, created on first use"""
+    if self._async_env is None:
+      self._async_env = self.env.overlay(
+        bytecode_cache=(
+          FileSystemBytecodeCache(self.bytecode_cache_directory, "__jinja2_async_%s.cache")
+          if self.bytecode_cache_directory is not None
+          else None
+        ),
+        enable_async=True,
+      )
+    return self._async_env
+
+  @classmethod
+  def invalidate(cls) -> None:
+    """Drop memoized markup, manifest indices and cached responses; called on config reloads"""
+    render_preload_links.cache_clear()
+    render_vite_asset.cache_clear()
+    render_vite_hmr_client.cache_clear()
+    cls._manifests.clear()
+    cls._generation += 1
+
+  @classmethod
+  def manifest(cls) -> ViteManifest:
+    """Shared manifest index for the configured `manifest_path`, loaded on first use"""
+    manifest_path: str = Rizzler._manifest_path
+    if manifest_path not in cls._manifests:
+      cls._manifests.setdefault(manifest_path, ViteManifest(manifest_path))
+    return cls._manifests[manifest_path]
+
+  @classmethod
+  def manifest_version(cls) -> Optional[float]:
+    """Version of the manifest `vite_asset` currently resolves from; None outside production"""
+    if Rizzler._mode != "production":
+      return None
+    manifest: ViteManifest = cls.manifest()
+    manifest.refresh()
+    return manifest.version
+
+  def preload_links(self, name: str, template: Optional[Template] = None) -> str:
+    """
+    `Link` header value for the entries template `name` references, re-read whenever Jinja
+    reloads the template; empty when `link_headers` is off or nothing is referenced.
+
+    ---
+    """
+    if not self.link_headers:
+      return ""
+    template = template or self.get_template(name)
+    cached: Optional[Tuple[Template, Tuple[str, ...], bool]] = self._entries.get(name)
+    if cached is None or cached[0] is not template:
+      cached = (template, *referenced_entries(self.env, name))
+      self._entries[name] = cached
+    _, entries, hmr_client = cached
+    if not entries and not hmr_client:
+      return ""
+    return render_preload_links(
+      entries,
+      hmr_client,
+      Rizzler._mode,
+      Rizzler._static_url,
+      Rizzler._manifest_path,
+      self.manifest_version(),
+    )
+
+  def precompile(self) -> Tuple[List[str], Dict[str, TemplateError]]:
+    """
+    Compiles every template for both the buffered and the streaming environment through the
+    bytecode cache; returns compiled names and failures.
+
+    ---
+    """
+    compiled: List[str] = []
+    failures: Dict[str, TemplateError] = {}
+    for name in self.env.list_templates():
+      try:
+        self.env.get_template(name)
+        self.async_env().get_template(name)
+      except TemplateError as error:
+        failures[name] = error
+        continue
+      compiled.append(name)
+    return compiled, failures
+
+  def TemplateResponse(self, *args: Any, **kwargs: Any) -> Response:  # type: ignore[override]
+    """
+    Accepts both `(request, name, context, ...)` and the legacy `(name, context, ...)` call forms
+    and adds the `Link` preload header when `link_headers` is set. With the response cache
+    enabled, passing a JSON-serializable `cache_context` serves the body rendered for an equal
+    `cache_context`.
+
+    ---
+    """
+    arguments: List[Any] = list(args)
+    if arguments and isinstance(arguments[0], str):
+      name: str = arguments.pop(0)
+      context: Dict[str, Any] = dict(arguments.pop(0) if arguments else kwargs.pop("context", {}))
+      request: Request = kwargs.pop("request", None) or context["request"]
+    else:
+      request = arguments.pop(0) if arguments else kwargs.pop("request")
+      name = arguments.pop(0) if arguments else kwargs.pop("name")
+      context = dict((arguments.pop(0) if arguments else kwargs.pop("context", None)) or {})
+    cache_context: Optional[Dict[str, Any]] = kwargs.pop("cache_context", None)
+    options: Dict[str, Any] = dict(
+      zip(("status_code", "headers", "media_type", "background"), arguments), **kwargs
+    )
+    context.setdefault("request", request)
+    for context_processor in getattr(self, "context_processors", []):
+      context.update(context_processor(request))
+    digest: Optional[str] = None
+    if self.response_cache_size > 0 and cache_context is not None:
+      digest = context_digest(cache_context)
+    started: float = perf_counter() if Metrics._enabled else 0.0
+    if digest is None:
+      response: Response = super().TemplateResponse(request, name, context, **options)
+      if started:
+        Metrics.observe("rizzler_template_render_seconds", perf_counter() - started, template=name)
+      link: str = self.preload_links(name, response.template)  # type: ignore[attr-defined]
+      if link:
+        response.headers.append("link", link)
+      return response
+    template: Template = self.get_template(name)
+    key: ResponseKey = (name, digest, self._generation, self.manifest_version())
+    with self._responses_lock:
+      cached: Optional[CachedResponse] = self._responses.get(key)
+      if cached is not None and cached.template is template:
+        self._responses.move_to_end(key)
+      else:
+        cached = None
+    if cached is None:
+      body: bytes = template.render(context).encode("utf-8")
+      if started:
+        Metrics.observe("rizzler_template_render_seconds", perf_counter() - started, template=name)
+      cached = CachedResponse(body, f'"{ sha256(body).hexdigest()[:32] }"', template)
+      with self._responses_lock:
+        self._responses[key] = cached
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.response_cache_size:
+          self._responses.popitem(last=False)
+    elif started:
+      Metrics.increment("rizzler_template_cache_hits_total", template=name)
+    response_headers: Dict[str, str] = {**(options.get("headers") or {}), "etag": cached.etag}
+    link = self.preload_links(name, template)
+    if link:
+      response_headers["link"] = link
+    if_none_match: List[str] = [
+      tag.strip() for tag in request.headers.get("if-none-match", "").split(",")
+    ]
+    not_modified: bool = cached.etag in if_none_match or "*" in if_none_match
+    return CachedTemplateResponse(
+      template,
+      context,
+      b"" if not_modified else cached.body,
+      304 if not_modified else options.get("status_code", 200),
+      response_headers,
+      options.get("media_type"),
+      options.get("background"),
+    )
+
+  def StreamingTemplateResponse(
+    self,
+    request: Request,
+    name: str,
+    context: Optional[Dict[str, Any]] = None,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+    media_type: str = "text/html",
+    background: Optional[BackgroundTask] = None,
+    flush_size: int = 4096,
+  ) -> StreamingResponse:
+    """
+    Streams the rendered template, sending the document head with its Vite tags as soon as it
+    is rendered so asset fetches start while slower sections of the body are still rendering;
+    this requires `vite_hmr_client` and `vite_asset` to be called inside `<head>`.
+
+    ---
+    """
+    context = dict(context or {})
+    context.setdefault("request", request)
+    for context_processor in getattr(self, "context_processors", []):
+      context.update(context_processor(request))
+    template: Template = self.async_env().get_template(name)
+    response: StreamingResponse = StreamingResponse(
+      stream_template(template, context, flush_size),
+      status_code=status_code,
+      headers=headers,
+      media_type=media_type,
+      background=background,
+    )
+    link: str = self.preload_links(name)
+    if link:
+      response.headers.append("link", link)
+    return response
 
   @classmethod
   def vite_asset(cls, path: str) -> Markup:
-    tags: List[str] = []
-    tags.append(
-      """
-      <script async defer type="module" src="http://localhost:5173/%s"></script>
-      """
-      % path
+    return render_vite_asset(
+      path, Rizzler._mode, Rizzler._static_url, Rizzler._manifest_path, cls.manifest_version()
     )
-    return Markup("\n".join(tags))
 
   @classmethod
   def vite_hmr_client(cls) -> Markup:
     """ """
-    tags: List[str] = []
-    tags.append(
-      """
-      <script type="module" src="http://localhost:5173/@vite/client"></script>
-      """
-    )
-    if Rizzler._framework == "react":
-      tags.append(
-        """
-        <script type="module">
-          import RefreshRuntime from 'http://localhost:5173/@react-refresh'
-          RefreshRuntime.injectIntoGlobalHook(window)
-          window.$RefreshReg$ = () => {{}}
-          window.$RefreshSig$ = () => (type) => type
-          window.__vite_plugin_react_preamble_installed__=true
-        </script>
-        """
-      )
-    return Markup("\n".join(tags))
+    return render_vite_hmr_client(Rizzler._framework, Rizzler._mode)
+
 
+Rizzler.on_config_change(RizzleTemplates.invalidate)
 
-__all__ = ("RizzleTemplates",)
+__all__ = ("BYTECODE_CACHE_DIRECTORY", "RizzleTemplates")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/trash.py
+# VERSION:     0.1.9
+# CREATED:     2024-07-01 11:20
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing trash directory helpers that let `rzl clean` return before deletion ends"""
+
+### Standard packages ###
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from os import listdir, lstat, makedirs, path, removedirs, replace, rmdir, scandir, unlink
+from shutil import rmtree
+from subprocess import DEVNULL, Popen
+from sys import argv, executable
+from typing import Iterable, List, NamedTuple, Optional, Set, Tuple
+from uuid import uuid4
+
+TRASH_DIRECTORY: str = ".rizzler/trash"
+
+
+class TreeSize(NamedTuple):
+  files: int
+  size: int
+
+
+def scan(directory: str, remove: bool) -> Tuple[List[str], int, int]:
+  """Subdirectories, file count and apparent size directly under `directory`, unlinking files"""
+  subdirectories: List[str] = []
+  files: int = 0
+  size: int = 0
+  try:
+    with scandir(directory) as entries:
+      for entry in entries:
+        try:
+          if entry.is_dir(follow_symlinks=False):
+            subdirectories.append(entry.path)
+            continue
+          files += 1
+          size += entry.stat(follow_symlinks=False).st_size
+          if remove:
+            unlink(entry.path)
+        except FileNotFoundError:
+          continue
+  except (FileNotFoundError, NotADirectoryError):
+    pass
+  return subdirectories, files, size
+
+
+def walk(root: str, remove: bool = False, max_workers: Optional[int] = None) -> TreeSize:
+  """
+  Scans `root` with one thread-pool task per directory, so deep and wide trees such as
+  `node_modules` are listed and unlinked concurrently; with `remove`, directories are then
+  removed children-first and `root` itself is gone afterwards.
+
+  ---
+  """
+  if not path.isdir(root) or path.islink(root):
+    if not path.lexists(root):
+      return TreeSize(0, 0)
+    size: int = lstat(root).st_size
+    if remove:
+      unlink(root)
+    return TreeSize(1, size)
+  directories: List[str] = [root]
+  files: int = 0
+  total: int = 0
+  with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    pending: Set[Future] = {executor.submit(scan, root, remove)}
+    while pending:
+      done, pending = wait(pending, return_when=FIRST_COMPLETED)
+      for future in done:
+        subdirectories, count, size = future.result()
+        files += count
+        total += size
+        directories.extend(subdirectories)
+        pending.update(executor.submit(scan, child, remove) for child in subdirectories)
+  if remove:
+    for directory in reversed(directories):  # every child was appended after its parent
+      try:
+        rmdir(directory)
+      except FileNotFoundError:
+        continue
+      except OSError:
+        rmtree(directory, ignore_errors=True)
+  return TreeSize(files, total)
+
+
+def move_to_trash(targets: Iterable[str], trash: str = TRASH_DIRECTORY) -> Tuple[str, List[str]]:
+  """
+  Renames every existing target into a fresh batch directory under `trash`, which is atomic and
+  constant-time on the same filesystem; returns the batch and the targets that were removed.
+  Targets that cannot be renamed there, such as mount points or Docker volumes on another device,
+  are deleted in place instead.
+
+  ---
+  """
+  batch: str = path.join(trash, uuid4().hex)
+  makedirs(batch)
+  moved: List[str] = []
+  for index, target in enumerate(targets):
+    if not path.lexists(target):
+      continue
+    try:
+      replace(target, path.join(batch, f"{ index }-{ path.basename(path.normpath(target)) }"))
+    except OSError:  # EXDEV or EBUSY
+      walk(target, remove=True)
+    moved.append(target)
+  return batch, moved
+
+
+def empty_trash(trash: str = TRASH_DIRECTORY, max_workers: Optional[int] = None) -> TreeSize:
+  """Deletes every batch under `trash`, including those left by interrupted runs"""
+  files: int = 0
+  size: int = 0
+  if path.isdir(trash):
+    for batch in listdir(trash):
+      freed: TreeSize = walk(path.join(trash, batch), remove=True, max_workers=max_workers)
+      files += freed.files
+      size += freed.size
+    try:
+      removedirs(trash)  # and `.rizzler` when the trash was all it held
+    except OSError:
+      pass
+  return TreeSize(files, size)
+
+
+def empty_trash_detached(trash: str = TRASH_DIRECTORY) -> int:
+  """Empties `trash` from a new session that outlives the calling process; returns its pid"""
+  process: Popen = Popen(
+    (executable, "-m", "rizzler.trash", trash),
+    stdin=DEVNULL,
+    stdout=DEVNULL,
+    stderr=DEVNULL,
+    start_new_session=True,
+  )
+  return process.pid
+
+
+if __name__ == "__main__":
+  empty_trash(argv[1] if len(argv) > 1 else TRASH_DIRECTORY)
+
+
+__all__ = (
+  "TRASH_DIRECTORY",
+  "TreeSize",
+  "empty_trash",
+  "empty_trash_detached",
+  "move_to_trash",
+  "walk",
+)
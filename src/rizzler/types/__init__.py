@@ -11,6 +11,7 @@
 # *************************************************************
 
 ### Local modules ###
+from rizzler.types.lazy_group import LazyGroup
 from rizzler.types.mutex_option import MutexOption
 
-__all__ = ("MutexOption",)
+__all__ = ("LazyGroup", "MutexOption")
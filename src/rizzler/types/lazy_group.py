@@ -0,0 +1,36 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/types/lazy_group.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-16 11:05
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+
+### Standard packages ###
+from importlib import import_module
+from typing import Any, Dict, List, Optional
+
+### Third-party packages ###
+from click import Command, Context, Group
+
+
+class LazyGroup(Group):
+  def __init__(self, *args: Any, **kwargs: Any) -> None:
+    self.lazy_subcommands: Dict[str, str] = kwargs.pop("lazy_subcommands", {})
+    super(LazyGroup, self).__init__(*args, **kwargs)
+
+  def get_command(self, ctx: Context, cmd_name: str) -> Optional[Command]:
+    if cmd_name in self.lazy_subcommands:
+      module_name, attribute = self.lazy_subcommands[cmd_name].rsplit(":", 1)
+      return getattr(import_module(module_name), attribute)
+    return super(LazyGroup, self).get_command(ctx, cmd_name)
+
+  def list_commands(self, ctx: Context) -> List[str]:
+    return sorted({*super(LazyGroup, self).list_commands(ctx), *self.lazy_subcommands})
+
+
+__all__ = ("LazyGroup",)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/vite_manifest.py
+# VERSION:     0.1.9
+# CREATED:     2024-06-14 21:02
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing `ViteManifest` class for resolving hashed build output"""
+
+### Standard packages ###
+from os import stat
+from threading import Lock
+from time import monotonic
+from typing import Dict, List, Optional, Set, Tuple
+
+### Third-party packages ###
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+
+
+class ManifestChunk(BaseModel):
+  """Single chunk record as written by Vite under `build.manifest`"""
+
+  css: List[str] = []
+  dynamicImports: List[str] = []
+  file: str
+  imports: List[str] = []
+  isEntry: bool = False
+  src: Optional[str] = None
+
+
+class ManifestEntry(BaseModel):
+  """Entry chunk with its CSS and static imports resolved transitively"""
+
+  model_config = ConfigDict(frozen=True)
+
+  css: Tuple[str, ...] = ()
+  file: str
+  imports: Tuple[str, ...] = ()
+
+
+class ViteManifest(object):
+  """
+  In-memory index over Vite's `manifest.json`.
+
+  The manifest is parsed once and indexed by source path; the file is only re-read when its
+  modification time changes, and the modification time itself is checked at most once every
+  `check_interval` seconds so that lookups stay off the disk on the hot path.
+  """
+
+  def __init__(self, manifest_path: str, check_interval: float = 2.0) -> None:
+    self.check_interval: float = check_interval
+    self.manifest_path: str = manifest_path
+    self._checked_at: float = float("-inf")
+    self._entries: Dict[str, ManifestEntry] = {}
+    self._lock: Lock = Lock()
+    self._mtime: Optional[float] = None
+
+  @property
+  def entries(self) -> Dict[str, ManifestEntry]:
+    """Current index by manifest key and source path, loading the manifest if needed"""
+    self.refresh()
+    return self._entries
+
+  @staticmethod
+  def index(chunks: Dict[str, ManifestChunk]) -> Dict[str, ManifestEntry]:
+    entries: Dict[str, ManifestEntry] = {}
+    for key, chunk in chunks.items():
+      css: List[str] = []
+      imports: List[str] = []
+      seen: Set[str] = set()
+      pending: List[str] = [key]
+      while pending:
+        name: str = pending.pop(0)
+        if name in seen or name not in chunks:
+          continue
+        seen.add(name)
+        current: ManifestChunk = chunks[name]
+        if name != key and current.file not in imports:
+          imports.append(current.file)
+        for stylesheet in current.css:
+          if stylesheet not in css:
+            css.append(stylesheet)
+        pending.extend(current.imports)
+      entries[key] = ManifestEntry(css=tuple(css), file=chunk.file, imports=tuple(imports))
+      if chunk.src is not None and chunk.src != key:
+        entries[chunk.src] = entries[key]
+    return entries
+
+  def load(self) -> None:
+    """Parse the manifest file unconditionally and swap in the new index"""
+    mtime: float = stat(self.manifest_path).st_mtime
+    with open(self.manifest_path, "rb") as stream:
+      chunks: Dict[str, ManifestChunk] = TypeAdapter(Dict[str, ManifestChunk]).validate_json(
+        stream.read()
+      )
+    self._entries = self.index(chunks)
+    self._mtime = mtime
+
+  @property
+  def version(self) -> Optional[float]:
+    """Modification time of the currently loaded manifest, or None if never loaded"""
+    return self._mtime
+
+  def refresh(self) -> None:
+    """Reload the manifest if its modification time has changed since last load"""
+    now: float = monotonic()
+    if now - self._checked_at < self.check_interval:
+      return
+    with self._lock:
+      if now - self._checked_at < self.check_interval:
+        return
+      if self._mtime is None or stat(self.manifest_path).st_mtime != self._mtime:
+        self.load()
+      self._checked_at = now
+
+  def resolve(self, path: str) -> ManifestEntry:
+    self.refresh()
+    try:
+      return self._entries[path]
+    except KeyError:
+      raise ValueError(f'"{ path }" is not an entry in Vite manifest "{ self.manifest_path }".')
+
+
+__all__ = ("ManifestChunk", "ManifestEntry", "ViteManifest")
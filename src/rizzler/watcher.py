@@ -0,0 +1,175 @@
+#!/usr/bin/env python3.8
+# coding:utf-8
+# Copyright (C) 2024, All rights reserved.
+# FILENAME:    ~~/src/rizzler/watcher.py
+# VERSION:     0.1.9
+# CREATED:     2024-07-02 09:47
+# AUTHOR:      Sitt Guruvanich <aekazitt+github@gmail.com>
+# DESCRIPTION:
+#
+# HISTORY:
+# *************************************************************
+"""Module containing `Watcher` reporting debounced file changes through inotify or polling"""
+
+### Standard packages ###
+from asyncio import Event, Future, ensure_future, get_running_loop, sleep
+from ctypes import CDLL
+from ctypes.util import find_library
+from os import close, path, read, stat, stat_result, walk
+from struct import calcsize, unpack_from
+from sys import platform
+from typing import AsyncIterator, Dict, Iterable, Optional, Set, Tuple
+
+IN_ATTRIB: int = 0x00000004
+IN_CLOSE_WRITE: int = 0x00000008
+IN_MOVED_FROM: int = 0x00000040
+IN_MOVED_TO: int = 0x00000080
+IN_CREATE: int = 0x00000100
+IN_DELETE: int = 0x00000200
+IN_DELETE_SELF: int = 0x00000400
+IN_Q_OVERFLOW: int = 0x00004000
+IN_IGNORED: int = 0x00008000
+IN_ISDIR: int = 0x40000000
+IN_CLOEXEC: int = 0o2000000
+IN_NONBLOCK: int = 0o4000
+WATCH_MASK: int = (
+  IN_ATTRIB | IN_CLOSE_WRITE | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVED_FROM | IN_MOVED_TO
+)
+EVENT_HEADER: str = "iIII"
+EVENT_HEADER_SIZE: int = calcsize(EVENT_HEADER)
+
+
+def snapshot(roots: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+  """Modification time and size of every file under `roots`, for the polling fallback"""
+  files: Dict[str, Tuple[int, int]] = {}
+  for root in roots:
+    for directory, _, filenames in walk(root):
+      for filename in filenames:
+        file_path: str = path.join(directory, filename)
+        try:
+          status: stat_result = stat(file_path)
+        except OSError:
+          continue
+        files[file_path] = (status.st_mtime_ns, status.st_size)
+  return files
+
+
+class Watcher(object):
+  """
+  Recursively watches `roots` with inotify on Linux, falling back to polling modification times
+  every `interval` seconds elsewhere, and yields sets of changed paths from `changes` once no
+  further change has arrived for `debounce` seconds, so an editor's save burst or a `git
+  checkout` becomes a single batch. Roots that do not exist yet are ignored.
+  """
+
+  def __init__(self, roots: Iterable[str], debounce: float = 0.2, interval: float = 0.5) -> None:
+    self.debounce: float = debounce
+    self.interval: float = interval
+    self.roots: Tuple[str, ...] = tuple(roots)
+    self._changed: Event = Event()
+    self._descriptor: Optional[int] = None
+    self._libc: Optional[CDLL] = None
+    self._pending: Set[str] = set()
+    self._poller: Optional[Future] = None
+    self._watches: Dict[int, str] = {}
+
+  def add_watches(self, root: str) -> None:
+    """Watches `root` and every directory below it, reporting files already inside as changed"""
+    assert self._libc is not None and self._descriptor is not None
+    for directory, _, filenames in walk(root):
+      descriptor: int = self._libc.inotify_add_watch(
+        self._descriptor, directory.encode("utf-8"), WATCH_MASK
+      )
+      if descriptor >= 0:
+        self._watches[descriptor] = directory
+      self._pending.update(path.join(directory, filename) for filename in filenames)
+
+  async def changes(self) -> AsyncIterator[Set[str]]:
+    self.start()
+    try:
+      while True:
+        await self._changed.wait()
+        self._changed.clear()
+        while True:
+          await sleep(self.debounce)
+          if not self._changed.is_set():
+            break
+          self._changed.clear()
+        batch, self._pending = self._pending, set()
+        if batch:
+          yield batch
+    finally:
+      self.close()
+
+  def close(self) -> None:
+    if self._poller is not None:
+      self._poller.cancel()
+      self._poller = None
+    if self._descriptor is not None:
+      get_running_loop().remove_reader(self._descriptor)
+      close(self._descriptor)
+      self._descriptor = None
+      self._watches.clear()
+
+  async def poll(self) -> None:
+    previous: Dict[str, Tuple[int, int]] = snapshot(self.roots)
+    while True:
+      await sleep(self.interval)
+      current: Dict[str, Tuple[int, int]] = snapshot(self.roots)
+      changed: Set[str] = {
+        file_path
+        for file_path in previous.keys() | current.keys()
+        if previous.get(file_path) != current.get(file_path)
+      }
+      previous = current
+      if changed:
+        self._pending |= changed
+        self._changed.set()
+
+  def read_events(self) -> None:
+    assert self._descriptor is not None
+    try:
+      buffer: bytes = read(self._descriptor, 65536)
+    except BlockingIOError:
+      return
+    offset: int = 0
+    while offset < len(buffer):
+      descriptor, mask, _, length = unpack_from(EVENT_HEADER, buffer, offset)
+      name: bytes = buffer[offset + EVENT_HEADER_SIZE : offset + EVENT_HEADER_SIZE + length]
+      offset += EVENT_HEADER_SIZE + length
+      if mask & IN_Q_OVERFLOW:
+        self._pending.update(snapshot(self.roots))
+        continue
+      if mask & IN_IGNORED:
+        self._watches.pop(descriptor, None)
+        continue
+      directory: Optional[str] = self._watches.get(descriptor)
+      if directory is None or not name:
+        continue
+      changed: str = path.join(directory, name.rstrip(b"\0").decode("utf-8", "surrogateescape"))
+      if mask & IN_ISDIR:
+        if mask & (IN_CREATE | IN_MOVED_TO):
+          self.add_watches(changed)
+        continue
+      self._pending.add(changed)
+    self._changed.set()
+
+  def start(self) -> None:
+    roots: Tuple[str, ...] = tuple(filter(path.isdir, self.roots))
+    if platform.startswith("linux"):
+      try:
+        self._libc = CDLL(find_library("c") or "libc.so.6", use_errno=True)
+        descriptor: int = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+      except (AttributeError, OSError):
+        descriptor = -1
+      if descriptor >= 0:
+        self._descriptor = descriptor
+        for root in roots:
+          self.add_watches(root)
+        self._pending.clear()
+        get_running_loop().add_reader(descriptor, self.read_events)
+        return
+    self._poller = ensure_future(self.poll())
+
+
+__all__ = ("Watcher",)